@@ -6,10 +6,12 @@ Uses company database with input dependencies for impact analysis.
 """
 
 import logging
+from collections import defaultdict
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 from decimal import Decimal
 import numpy as np
+import pandas as pd
 
 logger = logging.getLogger(__name__)
 
@@ -1013,3 +1015,41 @@ class MarketAnalyzer:
         except Exception as e:
             logger.error(f"Error getting macro impact report: {e}")
             return []
+
+    def get_macro_impact_report_df(self, macro_symbol: str):
+        """Like get_macro_impact_report but returned as a DataFrame.
+
+        For downstream analytics (heatmaps, screens) this avoids the
+        rows → List[Dict] → DataFrame round-trip.
+        """
+        try:
+            return self.db.query_df("""
+                SELECT d.ticker, c.name, c.sector, d.input_name,
+                       d.impact_direction, d.impact_strength, d.description
+                FROM input_dependencies d
+                JOIN companies c ON c.ticker = d.ticker
+                WHERE d.macro_symbol = :symbol
+                ORDER BY d.impact_strength DESC
+            """, {'symbol': macro_symbol})
+        except Exception as e:
+            logger.error(f"Error getting macro impact report frame: {e}")
+            return pd.DataFrame()
+
+    def get_macro_impact_reports(self, macro_symbols: List[str]) -> Dict[str, List[Dict]]:
+        """Show affected companies for several macro factors in one query."""
+        try:
+            results = self.db.query("""
+                SELECT d.macro_symbol, d.ticker, c.name, c.sector, d.input_name,
+                       d.impact_direction, d.impact_strength, d.description
+                FROM input_dependencies d
+                JOIN companies c ON c.ticker = d.ticker
+                WHERE d.macro_symbol = ANY(:symbols)
+                ORDER BY d.macro_symbol, d.impact_strength DESC
+            """, {'symbols': macro_symbols})
+            reports = defaultdict(list)
+            for row in results:
+                reports[row['macro_symbol']].append(row)
+            return dict(reports)
+        except Exception as e:
+            logger.error(f"Error getting macro impact reports: {e}")
+            return {}
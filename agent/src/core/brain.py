@@ -6,14 +6,38 @@ All decisions are logged to ai_decisions table for audit trail.
 """
 
 import os
+import re
 import json
+import time
+import atexit
+import zlib
 import logging
+import httpx
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
 from .notifier import TelegramNotifier
 
 logger = logging.getLogger(__name__)
 
+# orjson is ~5-10x faster than stdlib json on the multi-KB payloads we
+# parse/serialize every cycle; fall back to stdlib if not installed
+try:
+    import orjson
+
+    def _json_loads(data):
+        return orjson.loads(data)
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    def _json_loads(data):
+        return json.loads(data)
+
+    def _json_dumps(obj) -> str:
+        return json.dumps(obj, ensure_ascii=False)
+
 # Try OpenAI client first (works with Ollama), fall back to Anthropic
 HAS_OPENAI = False
 HAS_ANTHROPIC = False
@@ -81,6 +105,53 @@ Svara ENBART med valid JSON, inget annat:
 Om inget ska göras, returnera tom decisions-lista.
 Var AGGRESSIV men DISCIPLINERAD. Bättre att vara i marknaden än att sitta passiv."""
 
+# Minify once at import: blank lines and deep heading markers tokenize
+# into prefill cost without adding instruction content. Must stay
+# deterministic so the prompt is byte-identical across calls (KV cache).
+SYSTEM_PROMPT = re.sub(r'\n{2,}', '\n', SYSTEM_PROMPT)
+SYSTEM_PROMPT = re.sub(r'^\s*### ', '# ', SYSTEM_PROMPT, flags=re.M)
+
+
+def _deflate(payload: str) -> bytes:
+    """Compress a text payload for BYTEA storage (see migration 007)."""
+    return zlib.compress(payload.encode('utf-8'), 6)
+
+
+def _inflate(blob) -> str:
+    """Read back a BYTEA payload; tolerates legacy uncompressed rows."""
+    if blob is None:
+        return ""
+    data = bytes(blob)
+    try:
+        return zlib.decompress(data).decode('utf-8')
+    except zlib.error:
+        return data.decode('utf-8', errors='replace')
+
+
+def _compress_context(context: str) -> str:
+    """Cheap token pruning of the market context.
+
+    Collapses runs of spaces, drops blank-line padding and removes exact
+    duplicate lines (repeated headlines, repeated price rows) while
+    keeping section headers and every line with tickers/numbers intact.
+    Cuts prompt tokens without touching information content.
+    """
+    seen = set()
+    out = []
+    for line in context.split("\n"):
+        line = " ".join(line.split())
+        if not line:
+            # Keep a single separator before section headers only
+            if out and out[-1]:
+                out.append("")
+            continue
+        if not line.startswith("##"):
+            if line in seen:
+                continue
+            seen.add(line)
+        out.append(line)
+    return "\n".join(out)
+
 
 class TradingBrain:
     """AI-powered trading decision engine. Supports Ollama (free) or Anthropic."""
@@ -89,18 +160,36 @@ class TradingBrain:
     OLLAMA_MODEL = "qwen/qwen2.5-coder-14b"
     ANTHROPIC_MODEL = "claude-sonnet-4-20250514"
 
+    # How long a built context stays fresh (seconds)
+    CONTEXT_TTL = 30
+
     def __init__(self, db):
         self.db = db
         self.backend = None  # 'ollama' or 'anthropic'
         self.notifier = TelegramNotifier()
+        self._ctx_cache = {}  # deep -> (timestamp, context)
+        self._log_buf = []  # buffered ai_decisions rows
+        self._log_last_flush = time.time()
+        self._company_map = None  # ticker -> (name, sector), 24h TTL
+        self._company_map_ts = 0.0
+        atexit.register(self._flush_decision_log)
         
         # Try Ollama first (free, local)
         ollama_url = os.getenv("OLLAMA_URL", "http://192.168.99.19:1234")
         if HAS_OPENAI:
             try:
+                # Long-lived keep-alive pool: the LLM host is on the LAN and
+                # we call it every cycle, so avoid per-call connection setup
+                self._http = httpx.Client(
+                    limits=httpx.Limits(max_keepalive_connections=4,
+                                        keepalive_expiry=300),
+                    timeout=120.0,
+                    transport=httpx.HTTPTransport(retries=2),
+                )
                 self.client = OpenAI(
                     base_url=f"{ollama_url}/v1",
                     api_key="lm-studio",  # LM Studio doesn't need a real key
+                    http_client=self._http,
                 )
                 self.backend = 'ollama'
                 self.model = self.OLLAMA_MODEL
@@ -136,21 +225,26 @@ class TradingBrain:
                 f"Total value: {balance['total_value']:.0f} SEK",
                 f"P&L vs 20k start: {balance['total_value'] - 20000:+.0f} SEK",
             ]
-            if not portfolio.empty:
+            open_pos = portfolio[portfolio['shares'].astype(float) > 0] \
+                if not portfolio.empty else portfolio
+            if not open_pos.empty:
                 lines.append("\nÖppna positioner:")
-                for _, p in portfolio.iterrows():
-                    shares = float(p.get('shares', 0))
-                    if shares <= 0:
-                        continue
-                    avg = float(p.get('avg_price', 0))
-                    # get current price
-                    prices = self.db.get_latest_prices([p['ticker']])
-                    cur = float(prices.iloc[0]['close']) if not prices.empty else avg
-                    pnl_pct = ((cur / avg) - 1) * 100 if avg else 0
-                    lines.append(
-                        f"  {p['ticker']}: {shares:.1f} st @ {avg:.2f}, "
-                        f"nu {cur:.2f} ({pnl_pct:+.1f}%)"
-                    )
+                # One batched price fetch for the whole portfolio (no N+1),
+                # then column-wise math instead of per-row iterrows
+                prices = self.db.get_latest_prices(open_pos['ticker'].tolist())
+                shares = open_pos['shares'].astype(float).to_numpy()
+                avg = open_pos['avg_price'].astype(float).to_numpy()
+                if prices.empty:
+                    cur = avg.copy()
+                else:
+                    close_map = prices.set_index('ticker')['close']
+                    cur = open_pos['ticker'].map(close_map).astype(float).to_numpy()
+                    cur = np.where(np.isnan(cur), avg, cur)
+                pnl_pct = np.where(avg > 0, (cur / avg - 1) * 100, 0.0)
+                lines.extend(
+                    f"  {t}: {s:.1f} st @ {a:.2f}, nu {c:.2f} ({p:+.1f}%)"
+                    for t, s, a, c, p in zip(open_pos['ticker'], shares, avg, cur, pnl_pct)
+                )
             else:
                 lines.append("Inga öppna positioner.")
             return "\n".join(lines)
@@ -158,13 +252,77 @@ class TradingBrain:
             logger.error(f"Portfolio context error: {e}")
             return "Portföljdata ej tillgänglig."
 
-    def _get_macro_context(self) -> str:
-        """Latest macro data."""
-        try:
-            rows = self.db.query("""
+    def _get_company_map(self) -> Dict[str, tuple]:
+        """ticker -> (name, sector) from the companies reference table.
+
+        The table is effectively immutable, so cache it for a day instead
+        of re-joining it into every price query.
+        """
+        if self._company_map is None or time.time() - self._company_map_ts > 86400:
+            try:
+                rows = self.db.query("SELECT ticker, name, sector FROM companies")
+                self._company_map = {
+                    r['ticker']: (r.get('name') or '', r.get('sector') or '')
+                    for r in rows
+                }
+                self._company_map_ts = time.time()
+            except Exception as e:
+                logger.error(f"Company map error: {e}")
+                if self._company_map is None:
+                    self._company_map = {}
+        return self._company_map
+
+    def _fetch_latest_snapshots(self, include_prices: bool = False) -> Dict[str, List[Dict]]:
+        """Fetch the latest macro/technical(/price) rows in one round-trip.
+
+        The three sections each need a DISTINCT ON latest-row scan; doing
+        them as CTEs aggregated with json_agg shares one round-trip and
+        one planner pass instead of three.
+        """
+        prices_cte = """, latest_prices AS (
+                SELECT DISTINCT ON (ticker) ticker, close, date
+                FROM prices
+                ORDER BY ticker, date DESC
+            )"""
+        prices_key = ",\n 'prices', (SELECT json_agg(p) FROM latest_prices p)"
+        rows = self.db.query(f"""
+            WITH latest_macro AS (
                 SELECT DISTINCT ON (symbol) symbol, value, change_pct, date
                 FROM macro ORDER BY symbol, date DESC
-            """)
+            ), latest_tech AS (
+                SELECT DISTINCT ON (ticker) ticker, date, rsi, sma20, sma50,
+                       momentum_score, pattern, pattern_signal
+                FROM technical_signals
+                ORDER BY ticker, date DESC
+            ), relevant_tech AS (
+                -- Only signals the LLM can act on: open positions, top
+                -- prospects, and tickers with an active pattern/momentum
+                SELECT * FROM latest_tech t
+                WHERE (t.rsi IS NOT NULL OR t.pattern IS NOT NULL)
+                  AND (t.pattern IS NOT NULL
+                   OR t.momentum_score > 70
+                   OR t.ticker IN (SELECT ticker FROM portfolio WHERE shares > 0)
+                   OR t.ticker IN (SELECT ticker FROM prospects
+                                   WHERE status = 'active'
+                                   ORDER BY confidence DESC LIMIT 10))
+            ){prices_cte if include_prices else ''}
+            SELECT json_build_object(
+                'macro', (SELECT json_agg(m) FROM latest_macro m),
+                'tech', (SELECT json_agg(t) FROM relevant_tech t)
+                {prices_key if include_prices else ''}
+            ) AS snapshots
+        """)
+        snapshots = rows[0]['snapshots'] if rows else {}
+        return {key: value or [] for key, value in (snapshots or {}).items()}
+
+    def _get_macro_context(self, rows: Optional[List[Dict]] = None) -> str:
+        """Latest macro data."""
+        try:
+            if rows is None:
+                rows = self.db.query("""
+                    SELECT DISTINCT ON (symbol) symbol, value, change_pct, date
+                    FROM macro ORDER BY symbol, date DESC
+                """)
             if not rows:
                 return "Makrodata ej tillgänglig."
             names = {
@@ -199,32 +357,63 @@ class TradingBrain:
         """Recent news (24h)."""
         try:
             cutoff = datetime.utcnow() - timedelta(hours=24)
+            # Project + truncate + rank in SQL: only the bytes the prompt
+            # needs cross the wire, strongest-signal headlines first
             rows = self.db.query("""
-                SELECT ticker, headline, sentiment, sentiment_score
+                SELECT ticker, LEFT(headline, 80) AS headline,
+                       sentiment, sentiment_score
                 FROM news WHERE published_at >= :cutoff
-                ORDER BY published_at DESC LIMIT 20
+                ORDER BY ABS(COALESCE(sentiment_score, 0)) DESC,
+                         published_at DESC
+                LIMIT 60
             """, {'cutoff': cutoff})
             if not rows:
                 return "Inga nyheter senaste 24h."
+            # Feeds repeat the same headline across sources; fold near
+            # duplicates on a normalized key and keep the instance with
+            # the strongest sentiment signal, capped at 20 headlines
+            best = {}
+            order = []
+            for r in rows:
+                key = re.sub(r'\W+', '', (r['headline'] or '').lower())[:60]
+                kept = best.get(key)
+                if kept is None:
+                    best[key] = r
+                    order.append(key)
+                elif abs(float(r.get('sentiment_score') or 0)) > \
+                        abs(float(kept.get('sentiment_score') or 0)):
+                    best[key] = r
+            rows = [best[k] for k in order[:20]]
             lines = []
             for r in rows:
                 ticker = f"[{r['ticker']}] " if r.get('ticker') else ""
                 sent = r.get('sentiment', 'neutral')
-                lines.append(f"{ticker}{r['headline'][:80]} ({sent})")
+                lines.append(f"{ticker}{r['headline']} ({sent})")
             return "\n".join(lines)
         except Exception as e:
             logger.error(f"News context error: {e}")
             return "Nyhetsdata ej tillgänglig."
 
-    def _get_technical_context(self) -> str:
+    def _get_technical_context(self, rows: Optional[List[Dict]] = None) -> str:
         """Latest technical signals for all companies."""
         try:
-            rows = self.db.query("""
-                SELECT DISTINCT ON (ticker) ticker, date, rsi, sma20, sma50,
-                       volume_ratio, momentum_score, pattern, pattern_signal
-                FROM technical_signals
-                ORDER BY ticker, date DESC
-            """)
+            if rows is None:
+                rows = self.db.query("""
+                    WITH latest_tech AS (
+                        SELECT DISTINCT ON (ticker) ticker, date, rsi, sma20, sma50,
+                               momentum_score, pattern, pattern_signal
+                        FROM technical_signals
+                        ORDER BY ticker, date DESC
+                    )
+                    SELECT * FROM latest_tech t
+                    WHERE (t.rsi IS NOT NULL OR t.pattern IS NOT NULL)
+                      AND (t.pattern IS NOT NULL
+                       OR t.momentum_score > 70
+                       OR t.ticker IN (SELECT ticker FROM portfolio WHERE shares > 0)
+                       OR t.ticker IN (SELECT ticker FROM prospects
+                                       WHERE status = 'active'
+                                       ORDER BY confidence DESC LIMIT 10))
+                """)
             if not rows:
                 return "Tekniska signaler ej tillgängliga."
             lines = []
@@ -287,22 +476,22 @@ class TradingBrain:
             logger.error(f"Reports context error: {e}")
             return "Rapportkalender ej tillgänglig."
 
-    def _get_prices_context(self) -> str:
+    def _get_prices_context(self, rows: Optional[List[Dict]] = None) -> str:
         """Current prices for all stocks (latest)."""
         try:
-            rows = self.db.query("""
-                SELECT DISTINCT ON (p.ticker) p.ticker, p.close, p.date,
-                       c.name, c.sector
-                FROM prices p
-                LEFT JOIN companies c ON c.ticker = p.ticker
-                ORDER BY p.ticker, p.date DESC
-            """)
+            if rows is None:
+                rows = self.db.query("""
+                    SELECT DISTINCT ON (ticker) ticker, close, date
+                    FROM prices
+                    ORDER BY ticker, date DESC
+                """)
             if not rows:
                 return "Prisdata ej tillgänglig."
+            companies = self._get_company_map()
             lines = []
             for r in rows:
-                name = r.get('name', '')
-                sector = f"({r.get('sector', '')})" if r.get('sector') else ""
+                name, sector = companies.get(r['ticker'], ('', ''))
+                sector = f"({sector})" if sector else ""
                 lines.append(f"{r['ticker']}: {float(r['close']):.2f} SEK {name} {sector}")
             return "\n".join(lines)
         except Exception as e:
@@ -313,29 +502,55 @@ class TradingBrain:
     # ------------------------------------------------------------------
 
     def build_context(self, deep: bool = False) -> str:
-        """Build full context string for Claude."""
-        sections = [
-            ("PORTFÖLJ", self._get_portfolio_context()),
-            ("MAKRO", self._get_macro_context()),
-            ("NYHETER (24h)", self._get_news_context()),
-            ("TEKNISKA SIGNALER", self._get_technical_context()),
-            ("PROSPECTS", self._get_prospects_context()),
-            ("RAPPORTER (5 dagar)", self._get_reports_context()),
-        ]
-        if deep:
-            sections.append(("ALLA PRISER", self._get_prices_context()))
+        """Build full context string for Claude.
+
+        The section queries are independent DB round-trips, so they run
+        concurrently and are joined in section order. SQLAlchemy's engine
+        pool hands each worker its own connection.
+
+        Results are cached for CONTEXT_TTL seconds so back-to-back calls
+        (make_decisions + generate_daily_summary) skip the DB fan-out;
+        execute_decisions clears the cache once trades have committed.
+        """
+        cached_at, cached = self._ctx_cache.get(deep, (0, None))
+        if cached is not None and time.time() - cached_at < self.CONTEXT_TTL:
+            return cached
+
+        with ThreadPoolExecutor(max_workers=7) as executor:
+            # Macro/technical(/price) latest-row scans share one bulk query
+            snapshots = executor.submit(self._fetch_latest_snapshots, deep)
+
+            def snapshot_rows(key):
+                # On bulk-fetch failure fall back to per-section queries
+                try:
+                    return snapshots.result().get(key)
+                except Exception as e:
+                    logger.error(f"Snapshot fetch error: {e}")
+                    return None
+
+            sections = [
+                ("PORTFÖLJ", self._get_portfolio_context),
+                ("MAKRO", lambda: self._get_macro_context(snapshot_rows('macro'))),
+                ("NYHETER (24h)", self._get_news_context),
+                ("TEKNISKA SIGNALER", lambda: self._get_technical_context(snapshot_rows('tech'))),
+                ("PROSPECTS", self._get_prospects_context),
+                ("RAPPORTER (5 dagar)", self._get_reports_context),
+            ]
+            if deep:
+                sections.append(("ALLA PRISER", lambda: self._get_prices_context(snapshot_rows('prices'))))
 
-        parts = []
-        for title, content in sections:
-            parts.append(f"## {title}\n{content}")
-        return "\n\n".join(parts)
+            futures = {title: executor.submit(fn) for title, fn in sections}
+            parts = [f"## {title}\n{futures[title].result()}" for title, _ in sections]
+        context = "\n\n".join(parts)
+        self._ctx_cache[deep] = (time.time(), context)
+        return context
 
     def make_decisions(self, deep: bool = False) -> Dict[str, Any]:
         """
         Call Claude Sonnet with full market context and get trading decisions.
         Returns parsed JSON response.
         """
-        context = self.build_context(deep=deep)
+        context = _compress_context(self.build_context(deep=deep))
         now = datetime.utcnow()
         user_msg = (
             f"Datum: {now.strftime('%Y-%m-%d %H:%M')} UTC\n\n"
@@ -346,10 +561,13 @@ class TradingBrain:
         logger.info(f"🧠 Calling {self.backend} ({self.model}) ({'deep' if deep else 'standard'} analysis)...")
 
         try:
+            # Decode cost scales with output length: 400 tokens covers the
+            # outlook/summary envelope, ~80 per decision, max 5 positions
             raw_text, prompt_tokens, response_tokens = self._call_llm(
                 system=SYSTEM_PROMPT,
                 user_msg=user_msg,
-                max_tokens=2000,
+                max_tokens=400 + 80 * 5,
+                json_mode=True,
             )
 
             logger.info(
@@ -357,15 +575,14 @@ class TradingBrain:
             )
 
             # Parse JSON from response (handle markdown code blocks)
+            # Fences only ever wrap the payload, so trim the edges instead
+            # of rebuilding the whole multi-KB string line by line
             json_str = raw_text.strip()
             if json_str.startswith("```"):
-                # Remove ```json ... ```
-                lines = json_str.split("\n")
-                json_str = "\n".join(
-                    l for l in lines if not l.strip().startswith("```")
-                )
+                json_str = json_str.removeprefix("```json").removeprefix("```")
+                json_str = json_str.removesuffix("```").strip()
 
-            decisions = json.loads(json_str)
+            decisions = _json_loads(json_str)
 
             # Log to ai_decisions table
             self._log_decision(
@@ -394,6 +611,46 @@ class TradingBrain:
             logger.error(f"Claude API error: {e}", exc_info=True)
             return {"decisions": [], "market_outlook": "neutral", "analysis_summary": f"API error: {e}"}
 
+    def batch_analyze(self, tasks: List[tuple], system: str,
+                      max_tokens_per_task: int = 500) -> Dict[str, Any]:
+        """
+        Fold several small analysis tasks into one LLM call.
+
+        tasks is a list of (label, prompt) pairs. The tasks share one
+        request (and one system-prompt prefill) and the model answers
+        with JSON keyed 1..N, which is mapped back to the labels.
+        Returns {label: answer}; empty dict on failure.
+        """
+        if not tasks:
+            return {}
+        parts = [
+            "Besvara följande fall. Svara ENBART med valid JSON där "
+            "nycklarna är fallens nummer (\"1\".. \"%d\")." % len(tasks)
+        ]
+        for i, (_, prompt) in enumerate(tasks, start=1):
+            parts.append(f"### Fall {i}\n{prompt}")
+        user_msg = "\n\n".join(parts)
+
+        try:
+            raw_text, _, _ = self._call_llm(
+                system=system,
+                user_msg=user_msg,
+                max_tokens=max_tokens_per_task * len(tasks),
+                json_mode=True,
+            )
+            json_str = raw_text.strip()
+            if json_str.startswith("```"):
+                json_str = json_str.removeprefix("```json").removeprefix("```")
+                json_str = json_str.removesuffix("```").strip()
+            answers = _json_loads(json_str)
+            return {
+                label: answers.get(str(i))
+                for i, (label, _) in enumerate(tasks, start=1)
+            }
+        except Exception as e:
+            logger.error(f"Batch analyze error: {e}")
+            return {}
+
     # ------------------------------------------------------------------
     # Validation
     # ------------------------------------------------------------------
@@ -430,6 +687,33 @@ class TradingBrain:
         num_positions = len(current_tickers)
         omxs30_change = self._get_omxs30_change()
 
+        # Batch the per-ticker signal/price lookups for all BUY candidates
+        # into one round-trip each instead of two queries per decision
+        buy_tickers = [
+            d.get("ticker", "") for d in raw
+            if d.get("action", "").upper() == "BUY" and d.get("ticker")
+        ]
+        tech_by_ticker = {}
+        price_by_ticker = {}
+        if buy_tickers:
+            try:
+                tech_rows = self.db.query("""
+                    SELECT DISTINCT ON (ticker) ticker, rsi, sma20
+                    FROM technical_signals
+                    WHERE ticker = ANY(:tickers)
+                    ORDER BY ticker, date DESC
+                """, {'tickers': buy_tickers})
+                tech_by_ticker = {r['ticker']: r for r in tech_rows}
+                price_rows = self.db.query("""
+                    SELECT DISTINCT ON (ticker) ticker, close
+                    FROM prices
+                    WHERE ticker = ANY(:tickers)
+                    ORDER BY ticker, date DESC
+                """, {'tickers': buy_tickers})
+                price_by_ticker = {r['ticker']: r for r in price_rows}
+            except Exception as e:
+                logger.error(f"Validation batch fetch error: {e}")
+
         for d in raw:
             action = d.get("action", "").upper()
             ticker = d.get("ticker", "")
@@ -472,25 +756,18 @@ class TradingBrain:
                         continue
 
                 # Validate technical signals (price > SMA20, RSI warning only)
-                tech = self.db.query("""
-                    SELECT rsi, sma20 FROM technical_signals
-                    WHERE ticker = :ticker ORDER BY date DESC LIMIT 1
-                """, {'ticker': ticker})
-
-                price_rows = self.db.query("""
-                    SELECT close FROM prices
-                    WHERE ticker = :ticker ORDER BY date DESC LIMIT 1
-                """, {'ticker': ticker})
+                tech = tech_by_ticker.get(ticker)
+                price_row = price_by_ticker.get(ticker)
 
-                if tech and tech[0].get('rsi'):
-                    rsi = float(tech[0]['rsi'])
+                if tech and tech.get('rsi'):
+                    rsi = float(tech['rsi'])
                     if rsi > 65:
                         logger.info(f"⚠️ {ticker} warning: RSI {rsi:.0f} > 65 (overköpt men tillåtet)")
                         # Don't reject - just warn
 
-                if tech and tech[0].get('sma20') and price_rows:
-                    sma20 = float(tech[0]['sma20'])
-                    price = float(price_rows[0]['close'])
+                if tech and tech.get('sma20') and price_row:
+                    sma20 = float(tech['sma20'])
+                    price = float(price_row['close'])
                     if price < sma20:
                         logger.info(f"⚠️ {ticker} warning: price {price:.2f} < SMA20 {sma20:.2f}")
                         # Don't reject, just warn - Claude may have good reason
@@ -600,6 +877,10 @@ class TradingBrain:
             except Exception as e:
                 logger.error(f"Error executing {action} {ticker}: {e}", exc_info=True)
 
+        if executed:
+            # Portfolio/balance changed — cached context is stale
+            self._ctx_cache.clear()
+
         return executed
 
     # ------------------------------------------------------------------
@@ -657,8 +938,9 @@ class TradingBrain:
     def generate_daily_summary(self) -> str:
         """Generate end-of-day summary using Claude."""
         context = self.build_context(deep=True)
-        
-        # Get today's AI decisions
+
+        # Get today's AI decisions (flush buffered rows first)
+        self._flush_decision_log()
         today_decisions = self.db.query("""
             SELECT decisions_json, timestamp FROM ai_decisions
             WHERE timestamp::date = CURRENT_DATE
@@ -698,24 +980,44 @@ class TradingBrain:
     # LLM abstraction
     # ------------------------------------------------------------------
 
-    def _call_llm(self, system: str, user_msg: str, max_tokens: int = 2000) -> tuple:
+    def _call_llm(self, system: str, user_msg: str, max_tokens: int = 2000,
+                  json_mode: bool = False) -> tuple:
         """
         Call LLM (Ollama or Anthropic). Returns (text, prompt_tokens, response_tokens).
+        json_mode constrains the OpenAI-compatible backend to emit valid JSON.
         """
         if self.backend == 'ollama':
-            response = self.client.chat.completions.create(
+            # Stream so we consume tokens as they are generated instead of
+            # blocking on the full completion; usage arrives in the final chunk.
+            extra_kwargs = {}
+            if json_mode:
+                extra_kwargs["response_format"] = {"type": "json_object"}
+            stream = self.client.chat.completions.create(
                 model=self.model,
                 max_tokens=max_tokens,
                 messages=[
                     {"role": "system", "content": system},
                     {"role": "user", "content": user_msg},
                 ],
+                **extra_kwargs,
                 temperature=0.3,
+                stream=True,
+                stream_options={"include_usage": True},
+                # Keep the model + its KV cache warm between cycles so the
+                # static system prompt prefix is not re-prefilled every call.
+                # SYSTEM_PROMPT must stay byte-identical for the cache to hit.
+                extra_body={"keep_alive": "30m", "options": {"num_keep": -1}},
             )
-            raw_text = response.choices[0].message.content
-            prompt_tokens = getattr(response.usage, 'prompt_tokens', 0) or 0
-            response_tokens = getattr(response.usage, 'completion_tokens', 0) or 0
-            return (raw_text, prompt_tokens, response_tokens)
+            chunks = []
+            prompt_tokens = response_tokens = 0
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    chunks.append(chunk.choices[0].delta.content)
+                usage = getattr(chunk, 'usage', None)
+                if usage:
+                    prompt_tokens = getattr(usage, 'prompt_tokens', 0) or 0
+                    response_tokens = getattr(usage, 'completion_tokens', 0) or 0
+            return ("".join(chunks), prompt_tokens, response_tokens)
         
         elif self.backend == 'anthropic':
             response = self.client.messages.create(
@@ -736,22 +1038,39 @@ class TradingBrain:
     # Logging
     # ------------------------------------------------------------------
 
+    # Flush the decision log after this many rows or seconds
+    LOG_FLUSH_SIZE = 16
+    LOG_FLUSH_SECS = 60
+
     def _log_decision(self, prompt_tokens: int, response_tokens: int,
                       decisions_json: Any, market_context: str,
                       raw_response: str = ""):
-        """Log AI decision to database."""
+        """Buffer an AI decision for batched logging."""
+        self._log_buf.append({
+            'timestamp': datetime.utcnow(),
+            'prompt_tokens': prompt_tokens,
+            'response_tokens': response_tokens,
+            'decisions_json': _json_dumps(decisions_json),
+            'market_data_json': _deflate(market_context[:10000]),  # Truncate, then compress
+            'raw_response': _deflate(raw_response[:5000]),
+        })
+        if (len(self._log_buf) >= self.LOG_FLUSH_SIZE
+                or time.time() - self._log_last_flush >= self.LOG_FLUSH_SECS):
+            self._flush_decision_log()
+
+    def _flush_decision_log(self):
+        """Write buffered decisions in one multi-row transaction."""
+        self._log_last_flush = time.time()
+        if not self._log_buf:
+            return
         try:
-            self.db.execute("""
-                INSERT INTO ai_decisions 
+            self.db.execute_many("""
+                INSERT INTO ai_decisions
                     (timestamp, prompt_tokens, response_tokens, decisions_json, market_data_json, raw_response)
-                VALUES (%s, %s, %s, %s, %s, %s)
-            """, (
-                datetime.utcnow(),
-                prompt_tokens,
-                response_tokens,
-                json.dumps(decisions_json, ensure_ascii=False),
-                market_context[:10000],  # Truncate to avoid huge storage
-                raw_response[:5000],
-            ))
+                VALUES (:timestamp, :prompt_tokens, :response_tokens, :decisions_json, :market_data_json, :raw_response)
+            """, self._log_buf)
+            self._log_buf = []
         except Exception as e:
-            logger.error(f"Error logging AI decision: {e}")
+            logger.error(f"Error logging AI decisions: {e}")
+            # Keep rows for the next flush attempt, but bound the buffer
+            del self._log_buf[:-256]
@@ -17,10 +17,16 @@ Schedule:
 - Deep study cycles: Every 2 hours on weekends (more comprehensive)
 """
 
+import hashlib
 import logging
 import json
+import re
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta, date
 from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
 import pandas as pd
 from decimal import Decimal
 
@@ -30,18 +36,116 @@ try:
 except ImportError:
     HAS_ANTHROPIC = False
 
-from .brain import TradingBrain
+from .brain import TradingBrain, _json_dumps, _json_loads
 
 logger = logging.getLogger(__name__)
 
+# Hour (UTC) → study type, built once instead of per cycle. Hours 07-17
+# fall inside market hours and default to backtest if a cycle ever runs.
+_STUDY_ROTATION = (
+    'backtest',            # 00:00 UTC = 01:00 CET
+    'trade_review',        # 01:00 UTC = 02:00 CET
+    'strategy_evolution',  # 02:00 UTC = 03:00 CET
+    'news_research',       # 03:00 UTC = 04:00 CET
+    'report_study',        # 04:00 UTC = 05:00 CET
+    'self_study',          # 05:00 UTC = 06:00 CET
+    'backtest',            # 06:00 UTC = 07:00 CET
+) + ('backtest',) * 11 + (
+    'trade_review',        # 18:00 UTC = 19:00 CET
+    'backtest',            # 19:00 UTC = 20:00 CET
+    'report_study',        # 20:00 UTC = 21:00 CET
+    'news_research',       # 21:00 UTC = 22:00 CET
+    'strategy_evolution',  # 22:00 UTC = 23:00 CET
+    'self_study',          # 23:00 UTC = 00:00 CET
+)
+
+# weekday*24+hour → in market hours (07:00-17:00 UTC, Mon-Fri), built
+# once so the check is a single index load
+_MARKET_MASK = tuple(
+    day < 5 and 7 <= hour <= 17
+    for day in range(7) for hour in range(24)
+)
+
+# News relevance keywords with their score weights, compiled into one
+# alternation (longest first) so scoring is a single C-level scan over
+# the text instead of ~30 Python substring checks
+_NEWS_KEYWORD_WEIGHTS = {
+    # High relevance
+    'rapport': 25, 'earnings': 25, 'kvartalsrapport': 25, 'q1': 25, 'q2': 25,
+    'q3': 25, 'q4': 25, 'förvärv': 25, 'acquisition': 25, 'fusion': 25,
+    'merger': 25, 'avtal': 25, 'contract': 25, 'order': 25,
+    'beställning': 25, 'lansering': 25, 'launch': 25,
+    # Medium relevance
+    'kurs': 10, 'aktie': 10, 'stock': 10, 'börsen': 10, 'omxs': 10,
+    'rekommendation': 10, 'analysdag': 10, 'prognos': 10, 'forecast': 10,
+    'omsättning': 10, 'vinst': 10,
+}
+def _keyword_pattern(weights: Dict[str, int]) -> 're.Pattern':
+    return re.compile('|'.join(
+        re.escape(kw) for kw in sorted(weights, key=len, reverse=True)
+    ))
+
+
+_NEWS_KEYWORD_RE = _keyword_pattern(_NEWS_KEYWORD_WEIGHTS)
+
+# Per-sector tables merge the base keywords with the sector's own terms
+# (weight 15), so a sector-aware item is scored in one pass too
+_SECTOR_KEYWORD_WEIGHTS = {}
+_SECTOR_KEYWORD_RES = {}
+for _sector, _keywords in {
+    'industrials': ['industri', 'manufacturing', 'verkstad'],
+    'technology': ['tech', 'mjukvara', 'software', 'ai', 'digital'],
+    'basic materials': ['stål', 'steel', 'mining', 'gruv', 'råvara'],
+}.items():
+    _SECTOR_KEYWORD_WEIGHTS[_sector] = {**_NEWS_KEYWORD_WEIGHTS,
+                                        **{kw: 15 for kw in _keywords}}
+    _SECTOR_KEYWORD_RES[_sector] = _keyword_pattern(_SECTOR_KEYWORD_WEIGHTS[_sector])
+
+# Self-study insight patterns as one alternation of lookahead pairs,
+# ordered by confidence so the first (and only) matching group is the
+# one the old max-by-confidence pass would have picked
+_INSIGHT_PATTERNS = re.compile(
+    r'^(?:'
+    r'(?P<momentum_pattern>(?=.*momentum)(?=.*(?:volume|breakout)))|'
+    r'(?P<seasonal_pattern>(?=.*(?:january|december|q1|q4))(?=.*effect))|'
+    r'(?P<sector_pattern>(?=.*sector)(?=.*(?:rotation|outperform)))|'
+    r'(?P<timing_pattern>(?=.*friday)(?=.*(?:effect|pattern)))'
+    r')', re.DOTALL)
+
+_INSIGHT_TEMPLATES = {
+    'momentum_pattern': ('OMX momentum-strategi: {}...', 75),
+    'seasonal_pattern': ('Säsongseffekt identifierad: {}...', 70),
+    'sector_pattern': ('Sektorrotation på OMX: {}...', 65),
+    'timing_pattern': ('OMX Friday-mönster identifierat: {}...', 60),
+}
+
+# Catalyst-indicating keywords, tagged on research notes at insert time
+_CATALYST_RE = re.compile(r'rapport|lansering|contract|avtal', re.IGNORECASE)
+
+# Study type → runner method name, for dispatch without an if/elif chain
+_STUDY_RUNNERS = {
+    'backtest': 'run_backtest_engine',
+    'trade_review': 'run_trade_review',
+    'report_study': 'run_report_study',
+    'news_research': 'run_news_research',
+    'strategy_evolution': 'run_strategy_evolution',
+    'self_study': 'run_self_study',
+}
+
 
 class TradingStudent:
     """Continuous learning engine for the trading agent."""
-    
+
+    PRICE_PANEL_TTL = 3600  # seconds; hourly cycles re-read the same window
+    COMPANIES_TTL = 3600  # seconds; the tracked-company list rarely changes
+
     def __init__(self, db, web_search_func=None):
         self.db = db
         self.web_search = web_search_func  # Function for web searches
-        
+        self._price_panel_cache: Dict[Tuple[date, date], Tuple[float, Dict]] = {}
+        self._signal_cache: Dict[Tuple[str, date, date], Tuple[float, Dict]] = {}
+        self._companies_cache: Optional[Tuple[float, List[Dict]]] = None
+
         # Initialize Claude client for deep trade analysis
         self.claude_client = None
         if HAS_ANTHROPIC:
@@ -52,10 +156,9 @@ class TradingStudent:
     
     def is_market_hours(self) -> bool:
         """Check if we're currently in market hours (07:00-17:30 UTC)."""
-        now = datetime.utcnow()
-        hour = now.hour
         # Swedish market hours in UTC: 07:00-17:30 (09:00-18:30 CET with DST adjustments)
-        return 7 <= hour <= 17 and now.weekday() < 5
+        now = datetime.utcnow()
+        return _MARKET_MASK[now.weekday() * 24 + now.hour]
     
     def should_run_study(self) -> bool:
         """Determine if we should run a study cycle now."""
@@ -83,24 +186,8 @@ class TradingStudent:
         }
         
         # Rotate study types based on hour to spread load
-        study_rotation = {
-            18: 'trade_review',      # 18:00 UTC = 19:00 CET
-            19: 'backtest',          # 19:00 UTC = 20:00 CET  
-            20: 'report_study',      # 20:00 UTC = 21:00 CET
-            21: 'news_research',     # 21:00 UTC = 22:00 CET
-            22: 'strategy_evolution', # 22:00 UTC = 23:00 CET
-            23: 'self_study',        # 23:00 UTC = 00:00 CET
-            0: 'backtest',           # 00:00 UTC = 01:00 CET
-            1: 'trade_review',       # 01:00 UTC = 02:00 CET
-            2: 'strategy_evolution', # 02:00 UTC = 03:00 CET
-            3: 'news_research',      # 03:00 UTC = 04:00 CET
-            4: 'report_study',       # 04:00 UTC = 05:00 CET
-            5: 'self_study',         # 05:00 UTC = 06:00 CET
-            6: 'backtest',           # 06:00 UTC = 07:00 CET
-        }
-        
-        study_type = study_rotation.get(hour, 'backtest')
-        
+        study_type = _STUDY_ROTATION[hour]
+
         try:
             # Test database connection first
             try:
@@ -111,29 +198,12 @@ class TradingStudent:
                 results['error'] = f"Database connection failed: {db_error}"
                 results['status'] = 'database_error'
                 return results
-            
-            if study_type == 'backtest':
-                result = self.run_backtest_engine()
-                results['studies_completed'].append('backtest')
-            elif study_type == 'trade_review':
-                result = self.run_trade_review()
-                results['studies_completed'].append('trade_review')
-                results['learnings_added'] += result.get('learnings_added', 0)
-            elif study_type == 'report_study':
-                result = self.run_report_study()
-                results['studies_completed'].append('report_study')
-            elif study_type == 'news_research':
-                result = self.run_news_research()
-                results['studies_completed'].append('news_research')
-            elif study_type == 'strategy_evolution':
-                result = self.run_strategy_evolution()
-                results['studies_completed'].append('strategy_evolution')
-                results['insights_generated'] += result.get('insights_added', 0)
-            elif study_type == 'self_study':
-                result = self.run_self_study()
-                results['studies_completed'].append('self_study')
-                results['insights_generated'] += result.get('insights_added', 0)
-                
+
+            result = getattr(self, _STUDY_RUNNERS[study_type])()
+            results['studies_completed'].append(study_type)
+            results['learnings_added'] += result.get('learnings_added', 0)
+            results['insights_generated'] += result.get('insights_added', 0)
+
         except Exception as e:
             logger.error(f"Error in {study_type}: {e}", exc_info=True)
             results['error'] = str(e)
@@ -169,21 +239,25 @@ class TradingStudent:
             ('self_study', self.run_self_study),
         ]
         
-        for study_name, study_func in studies:
-            try:
-                logger.info(f"📚 Running {study_name}...")
-                result = study_func()
-                results['studies_completed'].append(study_name)
-                
-                if 'learnings_added' in result:
-                    results['learnings_added'] += result['learnings_added']
-                if 'insights_added' in result:
-                    results['insights_generated'] += result['insights_added']
-                if 'backtests_run' in result:
-                    results['backtests_run'] += result['backtests_run']
-                    
-            except Exception as e:
-                logger.error(f"Error in deep study {study_name}: {e}", exc_info=True)
+        # The studies touch different tables and external APIs and are
+        # I/O-bound, so run them concurrently; wall-clock becomes roughly
+        # the slowest study instead of the sum of all five
+        with ThreadPoolExecutor(max_workers=len(studies)) as executor:
+            futures = [(name, executor.submit(func)) for name, func in studies]
+            for study_name, future in futures:
+                try:
+                    result = future.result()
+                    results['studies_completed'].append(study_name)
+
+                    if 'learnings_added' in result:
+                        results['learnings_added'] += result['learnings_added']
+                    if 'insights_added' in result:
+                        results['insights_generated'] += result['insights_added']
+                    if 'backtests_run' in result:
+                        results['backtests_run'] += result['backtests_run']
+
+                except Exception as e:
+                    logger.error(f"Error in deep study {study_name}: {e}", exc_info=True)
         
         logger.info(f"📚🔬 Deep study complete: {len(results['studies_completed'])} studies")
         return results
@@ -229,231 +303,241 @@ class TradingStudent:
         # Test recent period with available data
         end_date = date.today()
         start_date = end_date - timedelta(days=7)  # Just last week for now
-        
-        for strategy in strategies[:2]:  # Limit to 2 strategies per cycle to avoid overload
+
+        # Every strategy backtests the same period, so fetch the price
+        # series once and share the NumPy arrays across all runs
+        price_arrays = self._load_price_arrays(start_date, end_date)
+
+        # The per-strategy runs are independent (shared arrays are
+        # read-only), so fan them out and aggregate on the main thread
+        cycle_strategies = strategies[:2]  # Limit to 2 strategies per cycle to avoid overload
+        with ThreadPoolExecutor(max_workers=len(cycle_strategies)) as executor:
+            backtest_futures = [
+                (strategy, executor.submit(
+                    self._run_strategy_backtest, strategy, start_date, end_date,
+                    price_arrays=price_arrays
+                ))
+                for strategy in cycle_strategies
+            ]
+
+        result_rows = []
+        for strategy, future in backtest_futures:
             try:
-                backtest_result = self._run_strategy_backtest(
-                    strategy, start_date, end_date
-                )
+                backtest_result = future.result()
                 results['backtests_run'] += 1
-                
+
                 if backtest_result['total_return_pct'] > results['best_return']:
                     results['best_return'] = backtest_result['total_return_pct']
                     results['best_strategy'] = strategy['name']
-                
-                # Save to database
-                self.db.execute("""
-                    INSERT INTO backtest_results 
-                    (strategy_name, params, period_start, period_end, trades_count, 
-                     win_rate, total_return_pct, avg_trade_pct, max_drawdown_pct, sharpe_ratio)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """, (
-                    strategy['name'],
-                    json.dumps(strategy['params']),
-                    start_date,
-                    end_date,
-                    backtest_result['trades_count'],
-                    backtest_result['win_rate'],
-                    backtest_result['total_return_pct'],
-                    backtest_result['avg_trade_pct'],
-                    backtest_result['max_drawdown_pct'],
-                    backtest_result.get('sharpe_ratio')
-                ))
-                
+
+                result_rows.append({
+                    'strategy_name': strategy['name'],
+                    'params': json.dumps(strategy['params']),
+                    'period_start': start_date,
+                    'period_end': end_date,
+                    'trades_count': backtest_result['trades_count'],
+                    'win_rate': backtest_result['win_rate'],
+                    'total_return_pct': backtest_result['total_return_pct'],
+                    'avg_trade_pct': backtest_result['avg_trade_pct'],
+                    'max_drawdown_pct': backtest_result['max_drawdown_pct'],
+                    'sharpe_ratio': backtest_result.get('sharpe_ratio'),
+                })
+
                 logger.info(f"📈 {strategy['name']}: {backtest_result['total_return_pct']:.1f}% return, "
                            f"{backtest_result['trades_count']} trades, {backtest_result['win_rate']:.1f}% win rate")
-                
+
             except Exception as e:
                 logger.error(f"Backtest error for {strategy['name']}: {e}")
-        
+
+        # One INSERT round-trip for the whole cycle instead of one per row
+        try:
+            self.db.execute_many("""
+                INSERT INTO backtest_results
+                (strategy_name, params, period_start, period_end, trades_count,
+                 win_rate, total_return_pct, avg_trade_pct, max_drawdown_pct, sharpe_ratio)
+                VALUES (:strategy_name, :params, :period_start, :period_end, :trades_count,
+                        :win_rate, :total_return_pct, :avg_trade_pct, :max_drawdown_pct, :sharpe_ratio)
+            """, result_rows)
+        except Exception as e:
+            logger.error(f"Error saving backtest results: {e}")
+
         return results
     
-    def _run_strategy_backtest(self, strategy: Dict, start_date: date, end_date: date) -> Dict:
+    def _load_price_arrays(self, start_date: date,
+                           end_date: date) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """Fetch the period's price series as (dates, closes) arrays per ticker.
+
+        Built once per backtest cycle so every strategy run reuses the same
+        arrays instead of re-fetching and re-converting the rows. Finished
+        panels are kept in memory for PRICE_PANEL_TTL: the agent runs as a
+        daemon and the hourly cycles keep asking for the same window, whose
+        rows (apart from today's) never change.
+        """
+        cached = self._price_panel_cache.get((start_date, end_date))
+        if cached and time.time() - cached[0] < self.PRICE_PANEL_TTL:
+            return cached[1]
+
+        tickers = [r['ticker'] for r in
+                   self.db.query("SELECT DISTINCT ticker FROM companies LIMIT 15")]  # Limit for speed
+        if not tickers:
+            return {}
+
+        try:
+            prices_by_ticker = defaultdict(list)
+            for row in self.db.query("""
+                SELECT ticker, date, close::float8 AS close FROM prices
+                WHERE ticker = ANY(:tickers) AND date BETWEEN :start_date AND :end_date
+                ORDER BY ticker, date
+            """, {'tickers': tickers, 'start_date': start_date, 'end_date': end_date}):
+                prices_by_ticker[row['ticker']].append(row)
+        except Exception as data_error:
+            logger.error(f"Backtest price fetch error: {data_error}")
+            return {}
+
+        panel = {
+            ticker: (
+                np.array([p['date'] for p in rows], dtype=object),
+                # close arrives pre-cast to float8 from SQL
+                np.array([p['close'] for p in rows])
+            )
+            for ticker, rows in prices_by_ticker.items()
+        }
+        self._price_panel_cache = {(start_date, end_date): (time.time(), panel)}
+        return panel
+
+    def _run_strategy_backtest(self, strategy: Dict, start_date: date, end_date: date,
+                               price_arrays: Optional[Dict[str, Tuple[np.ndarray, np.ndarray]]] = None) -> Dict:
         """Run a single strategy backtest."""
         strategy_name = strategy['name']
         params = strategy['params']
-        
-        # Get all tickers we track
-        tickers = self.db.query("SELECT DISTINCT ticker FROM companies LIMIT 15")  # Limit for speed
-        
-        trades = []
-        for ticker_row in tickers:
-            ticker = ticker_row['ticker']
-            
+
+        empty_result = {
+            'trades_count': 0, 'win_rate': 0, 'total_return_pct': 0,
+            'avg_trade_pct': 0, 'max_drawdown_pct': 0
+        }
+
+        # The signal predicate runs in SQL so only actual signal dates cross
+        # the wire; non-matching technical rows never leave the database
+        if strategy_name == 'golden_cross_sma20_sma50':
+            signal_where = "pattern = 'golden_cross' AND pattern_signal = 'bullish'"
+            signal_params = {}
+            label = 'golden_cross'
+        elif strategy_name == 'rsi_oversold_30':
+            signal_where = "rsi < :rsi_threshold"
+            signal_params = {'rsi_threshold': params['rsi_threshold']}
+            label = 'rsi_oversold'
+        elif strategy_name == 'momentum_breakout':
+            signal_where = "pattern = 'breakout' AND pattern_signal = 'bullish'"
+            signal_params = {}
+            label = 'momentum_breakout'
+        else:
+            return empty_result
+
+        if price_arrays is None:
+            price_arrays = self._load_price_arrays(start_date, end_date)
+        tickers = list(price_arrays)
+        if not tickers:
+            return empty_result
+
+        # Fetch the matching signal dates for all tickers in one round-trip
+        # and bucket client-side, instead of one query per ticker. Like the
+        # price panel, the result is cached so repeat cycles over the same
+        # window run entirely in memory.
+        signal_key = (strategy_name, start_date, end_date)
+        cached_signals = self._signal_cache.get(signal_key)
+        if cached_signals and time.time() - cached_signals[0] < self.PRICE_PANEL_TTL:
+            signals_by_ticker = cached_signals[1]
+        else:
             try:
-                # Get price and technical data for this ticker in the period
-                price_data = self.db.query("""
-                    SELECT date, close FROM prices 
-                    WHERE ticker = :ticker AND date BETWEEN :start_date AND :end_date
-                    ORDER BY date
-                """, {'ticker': ticker, 'start_date': start_date, 'end_date': end_date})
-                
-                tech_data = self.db.query("""
-                    SELECT date, rsi, sma20, sma50, pattern, pattern_signal
-                    FROM technical_signals 
-                    WHERE ticker = :ticker AND date BETWEEN :start_date AND :end_date
-                    ORDER BY date
-                """, {'ticker': ticker, 'start_date': start_date, 'end_date': end_date})
-                
-                if not price_data or not tech_data:
-                    continue
-                
-                # Debug: Log data types to understand the error
-                logger.debug(f"price_data type: {type(price_data)}, tech_data type: {type(tech_data)}")
-                if price_data:
-                    logger.debug(f"price_data[0] type: {type(price_data[0])}")
-                if tech_data:
-                    logger.debug(f"tech_data[0] type: {type(tech_data[0])}")
-                
+                signals_by_ticker = defaultdict(list)
+                for row in self.db.query(f"""
+                    SELECT ticker, date FROM technical_signals
+                    WHERE ticker = ANY(:tickers) AND date BETWEEN :start_date AND :end_date
+                    AND ({signal_where})
+                    ORDER BY ticker, date
+                """, {'tickers': tickers, 'start_date': start_date,
+                      'end_date': end_date, **signal_params}):
+                    signals_by_ticker[row['ticker']].append(row['date'])
             except Exception as data_error:
-                logger.error(f"Data fetch error for {ticker}: {data_error}")
-                continue
-            
-            # Apply strategy logic
-            if strategy_name == 'golden_cross_sma20_sma50':
-                trades.extend(self._find_golden_cross_trades(ticker, price_data, tech_data, params))
-            elif strategy_name == 'rsi_oversold_30':
-                trades.extend(self._find_rsi_oversold_trades(ticker, price_data, tech_data, params))
-            elif strategy_name == 'momentum_breakout':
-                trades.extend(self._find_momentum_breakout_trades(ticker, price_data, tech_data, params))
-        
-        # Calculate performance
-        if not trades:
-            return {
-                'trades_count': 0, 'win_rate': 0, 'total_return_pct': 0,
-                'avg_trade_pct': 0, 'max_drawdown_pct': 0
+                logger.error(f"Backtest data fetch error: {data_error}")
+                return empty_result
+            # Drop expired entries so the cache stays a handful of windows
+            now = time.time()
+            self._signal_cache = {
+                key: entry for key, entry in self._signal_cache.items()
+                if now - entry[0] < self.PRICE_PANEL_TTL
             }
-        
-        total_return = sum(t['return_pct'] for t in trades)
-        winning_trades = sum(1 for t in trades if t['return_pct'] > 0)
-        
+            self._signal_cache[signal_key] = (now, signals_by_ticker)
+
+        return_chunks = []
+        for ticker in tickers:
+            signal_dates = signals_by_ticker.get(ticker)
+            if not signal_dates:
+                continue
+
+            # Entry/exit lookups run as NumPy array ops on the shared
+            # per-ticker price arrays instead of per-row dict loops
+            price_dates, price_closes = price_arrays[ticker]
+
+            trades = self._trades_from_signals(
+                ticker, np.array(signal_dates, dtype=object), price_dates,
+                price_closes, params.get('hold_days', 7), label
+            )
+            if trades['return_pct'].size:
+                return_chunks.append(trades['return_pct'])
+
+        # Calculate performance on the concatenated returns column
+        if not return_chunks:
+            return empty_result
+
+        returns = np.concatenate(return_chunks)
+        total_return = float(returns.sum())
+
         return {
-            'trades_count': len(trades),
-            'win_rate': (winning_trades / len(trades)) * 100,
+            'trades_count': int(returns.size),
+            'win_rate': float((returns > 0).mean() * 100),
             'total_return_pct': total_return,
-            'avg_trade_pct': total_return / len(trades),
-            'max_drawdown_pct': min(t['return_pct'] for t in trades) if trades else 0,
+            'avg_trade_pct': total_return / returns.size,
+            'max_drawdown_pct': float(returns.min()),
+        }
+
+    def _trades_from_signals(self, ticker: str, signal_dates: np.ndarray,
+                             price_dates: np.ndarray, price_closes: np.ndarray,
+                             hold_days: int, strategy_label: str) -> Dict[str, np.ndarray]:
+        """Turn signal dates into simulated trades against the price series.
+
+        Entry is the first close on/after the signal date, exit the first
+        close on/after entry + hold_days. The price series arrives sorted
+        by date, so both lookups are binary searches via np.searchsorted
+        instead of linear scans over the whole series per signal.
+
+        Trades come back column-oriented — one array per field — so the
+        caller aggregates with array reductions instead of looping over
+        per-trade dicts.
+        """
+        if signal_dates.size == 0 or price_dates.size == 0:
+            entries = exits = returns = np.empty(0)
+            valid = np.zeros(signal_dates.size, dtype=bool)
+        else:
+            n = price_dates.size
+            entry_idx = np.searchsorted(price_dates, signal_dates, side='left')
+            exit_idx = np.searchsorted(
+                price_dates, signal_dates + timedelta(days=hold_days), side='left'
+            )
+            valid = (entry_idx < n) & (exit_idx < n)
+
+            entries = price_closes[entry_idx[valid]]
+            exits = price_closes[exit_idx[valid]]
+            returns = (exits / entries - 1) * 100
+
+        return {
+            'ticker': np.full(entries.size, ticker, dtype=object),
+            'strategy': np.full(entries.size, strategy_label, dtype=object),
+            'entry_date': signal_dates[valid],
+            'entry_price': entries,
+            'exit_price': exits,
+            'return_pct': returns,
         }
-    
-    def _find_golden_cross_trades(self, ticker: str, price_data: List, tech_data: List, params: Dict) -> List[Dict]:
-        """Find trades based on golden cross strategy."""
-        trades = []
-        
-        for i, tech in enumerate(tech_data):
-            if (tech.get('pattern') == 'golden_cross' and 
-                tech.get('pattern_signal') == 'bullish'):
-                
-                # Find entry price
-                entry_date = tech['date']
-                entry_price = None
-                for price in price_data:
-                    if price['date'] >= entry_date:
-                        entry_price = float(price['close'])
-                        break
-                
-                if not entry_price:
-                    continue
-                
-                # Find exit price after hold_days
-                exit_date = entry_date + timedelta(days=params['hold_days'])
-                exit_price = None
-                for price in price_data:
-                    if price['date'] >= exit_date:
-                        exit_price = float(price['close'])
-                        break
-                
-                if exit_price:
-                    return_pct = ((exit_price / entry_price) - 1) * 100
-                    trades.append({
-                        'ticker': ticker,
-                        'entry_date': entry_date,
-                        'entry_price': entry_price,
-                        'exit_price': exit_price,
-                        'return_pct': return_pct,
-                        'strategy': 'golden_cross'
-                    })
-        
-        return trades
-    
-    def _find_rsi_oversold_trades(self, ticker: str, price_data: List, tech_data: List, params: Dict) -> List[Dict]:
-        """Find trades based on RSI oversold strategy."""
-        trades = []
-        
-        for tech in tech_data:
-            rsi = tech.get('rsi')
-            if rsi and float(rsi) < params['rsi_threshold']:
-                
-                # Find entry price
-                entry_date = tech['date']
-                entry_price = None
-                for price in price_data:
-                    if price['date'] >= entry_date:
-                        entry_price = float(price['close'])
-                        break
-                
-                if not entry_price:
-                    continue
-                
-                # Find exit price after hold_days
-                exit_date = entry_date + timedelta(days=params['hold_days'])
-                exit_price = None
-                for price in price_data:
-                    if price['date'] >= exit_date:
-                        exit_price = float(price['close'])
-                        break
-                
-                if exit_price:
-                    return_pct = ((exit_price / entry_price) - 1) * 100
-                    trades.append({
-                        'ticker': ticker,
-                        'entry_date': entry_date,
-                        'entry_price': entry_price,
-                        'exit_price': exit_price,
-                        'return_pct': return_pct,
-                        'strategy': 'rsi_oversold'
-                    })
-        
-        return trades
-    
-    def _find_momentum_breakout_trades(self, ticker: str, price_data: List, tech_data: List, params: Dict) -> List[Dict]:
-        """Find trades based on momentum breakout strategy."""
-        trades = []
-        
-        for tech in tech_data:
-            if (tech.get('pattern') == 'breakout' and 
-                tech.get('pattern_signal') == 'bullish'):
-                
-                # Find entry price
-                entry_date = tech['date']
-                entry_price = None
-                for price in price_data:
-                    if price['date'] >= entry_date:
-                        entry_price = float(price['close'])
-                        break
-                
-                if not entry_price:
-                    continue
-                
-                # Find exit price after hold_days
-                exit_date = entry_date + timedelta(days=params.get('hold_days', 7))
-                exit_price = None
-                for price in price_data:
-                    if price['date'] >= exit_date:
-                        exit_price = float(price['close'])
-                        break
-                
-                if exit_price:
-                    return_pct = ((exit_price / entry_price) - 1) * 100
-                    trades.append({
-                        'ticker': ticker,
-                        'entry_date': entry_date,
-                        'entry_price': entry_price,
-                        'exit_price': exit_price,
-                        'return_pct': return_pct,
-                        'strategy': 'momentum_breakout'
-                    })
-        
-        return trades
     
     # ==================== STUDY MODULE 2: REPORT STUDY ====================
     
@@ -464,55 +548,116 @@ class TradingStudent:
         """
         logger.info("📊 Running report study...")
         
-        # Get recent reports that we haven't analyzed yet
+        # Resume from the last processed report date instead of
+        # anti-joining report_reactions on every cycle
+        watermark = None
+        try:
+            watermark_row = self.db.query("""
+                SELECT last_processed FROM study_watermarks
+                WHERE study_name = 'report_study'
+            """)
+            if watermark_row:
+                watermark = watermark_row[0]['last_processed']
+        except Exception as e:
+            logger.debug(f"Watermark lookup failed: {e}")
+
+        # Oldest first, so the watermark advances contiguously
         unanalyzed_reports = self.db.query("""
             SELECT rc.ticker, rc.report_date, rc.report_type, c.name, c.sector
             FROM report_calendar rc
             LEFT JOIN companies c ON c.ticker = rc.ticker
-            LEFT JOIN report_reactions rr ON rr.ticker = rc.ticker AND rr.report_date = rc.report_date
-            WHERE rc.report_date >= CURRENT_DATE - INTERVAL '60 days'
+            WHERE rc.report_date > COALESCE(:watermark, CURRENT_DATE - INTERVAL '60 days')
             AND rc.report_date <= CURRENT_DATE - INTERVAL '3 days'  -- Need at least 3 days for analysis
-            AND rr.id IS NULL  -- Not analyzed yet
-            ORDER BY rc.report_date DESC
+            ORDER BY rc.report_date ASC
             LIMIT 10
-        """)
-        
+        """, {'watermark': watermark})
+
         reactions_analyzed = 0
-        
+        reaction_rows = []
+
+        # One price query for all reports instead of one per report;
+        # each report then slices its own window from the grouped rows
+        report_prices = defaultdict(list)
+        if unanalyzed_reports:
+            report_dates = [r['report_date'] for r in unanalyzed_reports]
+            try:
+                for row in self.db.query("""
+                    SELECT ticker, date, close::float8 AS close FROM prices
+                    WHERE ticker = ANY(:tickers)
+                    AND date BETWEEN :start_date AND :end_date
+                    ORDER BY ticker, date
+                """, {
+                    'tickers': list({r['ticker'] for r in unanalyzed_reports}),
+                    'start_date': min(report_dates) - timedelta(days=5),
+                    'end_date': max(report_dates) + timedelta(days=15)
+                }):
+                    report_prices[row['ticker']].append(row)
+            except Exception as e:
+                logger.error(f"Error fetching report study prices: {e}")
+
+        # The watermark only advances past contiguous successes; a failed
+        # report halts it so that report is retried next cycle
+        processed_through = None
+        halted = False
         for report in unanalyzed_reports:
             try:
+                window_start = report['report_date'] - timedelta(days=5)
+                window_end = report['report_date'] + timedelta(days=15)
                 reaction = self._analyze_report_reaction(
-                    report['ticker'], 
-                    report['report_date'], 
-                    report['report_type']
+                    report['ticker'],
+                    report['report_date'],
+                    report['report_type'],
+                    price_data=[
+                        p for p in report_prices.get(report['ticker'], [])
+                        if window_start <= p['date'] <= window_end
+                    ]
                 )
                 
                 if reaction:
-                    # Save to database
-                    self.db.execute("""
-                        INSERT INTO report_reactions 
-                        (ticker, report_date, report_type, price_before, 
-                         price_day1, price_day5, price_day10,
-                         reaction_pct_day1, reaction_pct_day5, reaction_pct_day10)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                        ON CONFLICT (ticker, report_date, report_type) DO NOTHING
-                    """, (
-                        report['ticker'], report['report_date'], report['report_type'],
-                        reaction['price_before'], reaction['price_day1'], 
-                        reaction['price_day5'], reaction['price_day10'],
-                        reaction['reaction_pct_day1'], reaction['reaction_pct_day5'],
-                        reaction['reaction_pct_day10']
-                    ))
-                    
+                    reaction_rows.append({
+                        'ticker': report['ticker'],
+                        'report_date': report['report_date'],
+                        'report_type': report['report_type'],
+                        **reaction,
+                    })
+
                     reactions_analyzed += 1
                     logger.info(f"📊 {report['ticker']} {report['report_date']}: "
                                f"D1: {reaction['reaction_pct_day1']:+.1f}%, "
                                f"D5: {reaction['reaction_pct_day5']:+.1f}%, "
                                f"D10: {reaction['reaction_pct_day10']:+.1f}%")
-                
+
+                if not halted:
+                    processed_through = report['report_date']
+
             except Exception as e:
                 logger.error(f"Error analyzing report for {report['ticker']}: {e}")
-        
+                halted = True
+
+        # Flush all reactions in one INSERT round-trip
+        try:
+            self.db.execute_many("""
+                INSERT INTO report_reactions
+                (ticker, report_date, report_type, price_before,
+                 price_day1, price_day5, price_day10,
+                 reaction_pct_day1, reaction_pct_day5, reaction_pct_day10)
+                VALUES (:ticker, :report_date, :report_type, :price_before,
+                        :price_day1, :price_day5, :price_day10,
+                        :reaction_pct_day1, :reaction_pct_day5, :reaction_pct_day10)
+                ON CONFLICT (ticker, report_date, report_type) DO NOTHING
+            """, reaction_rows)
+
+            if processed_through is not None:
+                self.db.execute("""
+                    INSERT INTO study_watermarks (study_name, last_processed, updated_at)
+                    VALUES (%s, %s, NOW())
+                    ON CONFLICT (study_name) DO UPDATE
+                    SET last_processed = EXCLUDED.last_processed, updated_at = NOW()
+                """, ('report_study', processed_through))
+        except Exception as e:
+            logger.error(f"Error saving report reactions: {e}")
+            reactions_analyzed = 0
+
         # Generate insights from accumulated data
         insights = self._generate_report_insights()
         
@@ -521,49 +666,47 @@ class TradingStudent:
             'insights_generated': len(insights)
         }
     
-    def _analyze_report_reaction(self, ticker: str, report_date: date, report_type: str) -> Optional[Dict]:
-        """Analyze how a stock reacted to an earnings report."""
-        
-        # Get prices around the report date
-        price_data = self.db.query("""
-            SELECT date, close FROM prices
-            WHERE ticker = :ticker 
-            AND date BETWEEN :start_date AND :end_date
-            ORDER BY date
-        """, {
-            'ticker': ticker, 
-            'start_date': report_date - timedelta(days=5), 
-            'end_date': report_date + timedelta(days=15)
-        })
-        
+    def _analyze_report_reaction(self, ticker: str, report_date: date, report_type: str,
+                                 price_data: Optional[List[Dict]] = None) -> Optional[Dict]:
+        """Analyze how a stock reacted to an earnings report.
+
+        price_data can be passed pre-fetched (date-ordered rows around the
+        report date); otherwise the prices are queried here.
+        """
+        if price_data is None:
+            # Get prices around the report date
+            price_data = self.db.query("""
+                SELECT date, close::float8 AS close FROM prices
+                WHERE ticker = :ticker
+                AND date BETWEEN :start_date AND :end_date
+                ORDER BY date
+            """, {
+                'ticker': ticker,
+                'start_date': report_date - timedelta(days=5),
+                'end_date': report_date + timedelta(days=15)
+            })
+
         if len(price_data) < 10:
             return None
-        
-        # Find price before report (last trading day before or on report date)
-        price_before = None
-        for price in price_data:
-            if price['date'] <= report_date:
-                price_before = float(price['close'])
-            else:
-                break
-        
-        if not price_before:
+
+        # Rows are date-ordered; resolve the before/after checkpoints with
+        # binary searches instead of scanning the series per checkpoint
+        dates = np.array([p['date'] for p in price_data], dtype=object)
+        closes = np.array([p['close'] for p in price_data], dtype=np.float64)
+
+        # Last trading day before or on the report date
+        before_idx = np.searchsorted(dates, report_date, side='right') - 1
+        if before_idx < 0:
             return None
-        
-        # Find prices after report
-        price_day1 = None
-        price_day5 = None
-        price_day10 = None
-        
-        for price in price_data:
-            days_after = (price['date'] - report_date).days
-            
-            if days_after >= 1 and not price_day1:
-                price_day1 = float(price['close'])
-            if days_after >= 5 and not price_day5:
-                price_day5 = float(price['close'])
-            if days_after >= 10 and not price_day10:
-                price_day10 = float(price['close'])
+        price_before = float(closes[before_idx])
+
+        def first_close_after(days: int) -> Optional[float]:
+            idx = np.searchsorted(dates, report_date + timedelta(days=days), side='left')
+            return float(closes[idx]) if idx < dates.size else None
+
+        price_day1 = first_close_after(1)
+        price_day5 = first_close_after(5)
+        price_day10 = first_close_after(10)
         
         # Calculate reactions
         reaction = {
@@ -580,33 +723,31 @@ class TradingStudent:
     
     def _generate_report_insights(self) -> List[Dict]:
         """Generate insights from report reaction data."""
-        insights = []
-        
-        # Analyze patterns by sector
+        # Analyze patterns by sector; the significance filter runs in the
+        # HAVING clause so only insight-worthy sectors reach Python
         sector_analysis = self.db.query("""
-            SELECT c.sector, 
+            SELECT c.sector,
                    COUNT(*) as report_count,
-                   AVG(rr.reaction_pct_day1) as avg_day1_reaction,
-                   AVG(rr.reaction_pct_day5) as avg_day5_reaction,
-                   AVG(rr.reaction_pct_day10) as avg_day10_reaction
+                   AVG(rr.reaction_pct_day1)::float8 as avg_day1_reaction,
+                   LEAST(80, COUNT(*) * 10) as confidence
             FROM report_reactions rr
             JOIN companies c ON c.ticker = rr.ticker
             WHERE rr.created_at >= CURRENT_DATE - INTERVAL '90 days'
             GROUP BY c.sector
             HAVING COUNT(*) >= 3
+            AND ABS(AVG(rr.reaction_pct_day1)) > 2
         """)
-        
-        for sector in sector_analysis:
-            if abs(float(sector['avg_day1_reaction'] or 0)) > 2:
-                insights.append({
-                    'type': 'sector_report_pattern',
-                    'sector': sector['sector'],
-                    'pattern': f"Sektor {sector['sector']} reagerar i snitt {sector['avg_day1_reaction']:+.1f}% dag 1 efter rapport",
-                    'confidence': min(80, sector['report_count'] * 10),
-                    'sample_size': sector['report_count']
-                })
-        
-        return insights
+
+        return [
+            {
+                'type': 'sector_report_pattern',
+                'sector': sector['sector'],
+                'pattern': f"Sektor {sector['sector']} reagerar i snitt {sector['avg_day1_reaction']:+.1f}% dag 1 efter rapport",
+                'confidence': sector['confidence'],
+                'sample_size': sector['report_count']
+            }
+            for sector in sector_analysis
+        ]
     
     # ==================== STUDY MODULE 3: TRADE REVIEW ====================
     
@@ -635,10 +776,64 @@ class TradingStudent:
         """)
         
         learnings_added = 0
-        
+
+        # Fetch all price windows and macro rows for the cycle's trades up
+        # front — two queries instead of two per trade
+        trade_dates = []
         for trade in unreviewed_trades:
+            executed = trade['executed_at']
+            if isinstance(executed, str):
+                executed = datetime.fromisoformat(executed.replace('Z', '+00:00'))
+            trade_dates.append(executed.date())
+
+        trade_prices = defaultdict(list)
+        macro_rows = []
+        context_ok = bool(unreviewed_trades)
+        if unreviewed_trades:
+            try:
+                # The two prefetch queries are independent — overlap them
+                # on the pooled engine instead of waiting serially
+                with ThreadPoolExecutor(max_workers=2) as executor:
+                    price_future = executor.submit(self.db.query, """
+                        SELECT ticker, date, close::float8 AS close FROM prices
+                        WHERE ticker = ANY(:tickers)
+                        AND date BETWEEN :start_date AND :end_date
+                        ORDER BY ticker, date
+                    """, {
+                        'tickers': list({t['ticker'] for t in unreviewed_trades}),
+                        'start_date': min(trade_dates) - timedelta(days=30),
+                        'end_date': max(trade_dates) + timedelta(days=30)
+                    })
+                    macro_future = executor.submit(self.db.query, """
+                        SELECT symbol, value, change_pct, date FROM macro
+                        WHERE date BETWEEN :start_date AND :end_date
+                        ORDER BY date DESC
+                    """, {'start_date': min(trade_dates) - timedelta(days=30),
+                          'end_date': max(trade_dates)})
+
+                for row in price_future.result():
+                    trade_prices[row['ticker']].append(row)
+                macro_rows = macro_future.result()
+            except Exception as e:
+                # Fall back to per-trade queries inside _claude_analyze_trade
+                logger.error(f"Error prefetching trade review context: {e}")
+                context_ok = False
+
+        for trade, trade_day in zip(unreviewed_trades, trade_dates):
             try:
-                analysis = self._claude_analyze_trade(trade)
+                if context_ok:
+                    window_start = trade_day - timedelta(days=30)
+                    window_end = trade_day + timedelta(days=30)
+                    analysis = self._claude_analyze_trade(
+                        trade,
+                        price_history=[
+                            p for p in trade_prices.get(trade['ticker'], [])
+                            if window_start <= p['date'] <= window_end
+                        ],
+                        macro_context=[m for m in macro_rows if m['date'] <= trade_day][:5],
+                    )
+                else:
+                    analysis = self._claude_analyze_trade(trade)
                 if analysis:
                     # Save learning if Claude found something significant
                     if analysis.get('learning'):
@@ -658,7 +853,7 @@ class TradingStudent:
                         claude_analysis = %s,
                         updated_at = NOW()
                         WHERE id = %s
-                    """, (json.dumps(analysis), int(trade['id'])))
+                    """, (_json_dumps(analysis), int(trade['id'])))
                     
                     logger.info(f"🔍 {trade['ticker']}: {analysis.get('summary', 'Analyzed')}")
                 
@@ -667,38 +862,65 @@ class TradingStudent:
         
         return {'learnings_added': learnings_added}
     
-    def _claude_analyze_trade(self, trade: Dict) -> Optional[Dict]:
-        """Use Claude to deeply analyze a single trade."""
-        
+    def _claude_analyze_trade(self, trade: Dict, price_history: Optional[List[Dict]] = None,
+                              macro_context: Optional[List[Dict]] = None) -> Optional[Dict]:
+        """Use Claude to deeply analyze a single trade.
+
+        price_history and macro_context can be passed pre-fetched by
+        run_trade_review; otherwise they are queried here.
+        """
         ticker = trade['ticker']
         entry_price = float(trade['price'])
         current_price = float(trade['current_price']) if trade['current_price'] else entry_price
-        
+
         # Get context around the trade
         trade_date = trade['executed_at']
         if isinstance(trade_date, str):
             trade_date = datetime.fromisoformat(trade_date.replace('Z', '+00:00'))
-        
-        # Get price history around trade
-        price_history = self.db.query("""
-            SELECT date, close FROM prices
-            WHERE ticker = :ticker 
-            AND date BETWEEN :start_date AND :end_date
-            ORDER BY date
-        """, {
-            'ticker': ticker, 
-            'start_date': trade_date.date() - timedelta(days=30), 
-            'end_date': trade_date.date() + timedelta(days=30)
-        })
-        
-        # Get macro context at the time
-        macro_context = self.db.query("""
-            SELECT symbol, value, change_pct FROM macro
-            WHERE date <= :trade_date
-            ORDER BY date DESC
-            LIMIT 5
-        """, {'trade_date': trade_date.date()})
-        
+
+        if price_history is None:
+            # Get price history around trade
+            price_history = self.db.query("""
+                SELECT date, close::float8 AS close FROM prices
+                WHERE ticker = :ticker
+                AND date BETWEEN :start_date AND :end_date
+                ORDER BY date
+            """, {
+                'ticker': ticker,
+                'start_date': trade_date.date() - timedelta(days=30),
+                'end_date': trade_date.date() + timedelta(days=30)
+            })
+
+        if macro_context is None:
+            # Get macro context at the time
+            macro_context = self.db.query("""
+                SELECT symbol, value, change_pct FROM macro
+                WHERE date <= :trade_date
+                ORDER BY date DESC
+                LIMIT 5
+            """, {'trade_date': trade_date.date()})
+
+        # Identical structured inputs produce the same prompt, so check the
+        # cache before paying latency and cost for a fresh API call
+        cache_key = hashlib.sha256(json.dumps({
+            'ticker': ticker,
+            'entry': round(entry_price, 2),
+            'current': round(current_price, 2),
+            'date': trade_date.date().isoformat(),
+            'macro': [(m['symbol'], round(float(m['value']), 2)) for m in macro_context],
+        }, sort_keys=True).encode()).hexdigest()
+        try:
+            cached = self.db.query("""
+                SELECT response FROM claude_analysis_cache
+                WHERE prompt_hash = :prompt_hash
+                AND created_at >= NOW() - INTERVAL '30 days'
+            """, {'prompt_hash': cache_key})
+            if cached:
+                response = cached[0]['response']
+                return response if isinstance(response, dict) else _json_loads(response)
+        except Exception as e:
+            logger.debug(f"Claude cache lookup failed: {e}")
+
         # Build context for Claude
         price_text = "\n".join([f"{p['date']}: {p['close']:.2f} SEK" for p in price_history[-10:]])
         macro_text = "\n".join([f"{m['symbol']}: {m['value']:.2f} ({m['change_pct']:+.1f}%)" for m in macro_context])
@@ -722,7 +944,21 @@ PRISHISTORIK (senaste 10 dagarna):
 {price_text}
 
 MAKRO-KONTEXT VID TILLFÄLLET:
-{macro_text}
+{macro_text}"""
+
+        # Routine trades go to the cheap model; only outsized moves or
+        # high-conviction entries warrant the expensive one
+        if abs(pnl_pct) > 10 or float(trade.get('confidence') or 0) > 80:
+            model = "claude-sonnet-4-20250514"
+        else:
+            model = "claude-3-5-haiku-20241022"
+
+        # The instructions are static across every trade in a cycle; as a
+        # cache-marked system block the API's prefix cache reuses them
+        # instead of re-processing them per call
+        system_blocks = [{
+            "type": "text",
+            "text": """Du är en expert trading-analytiker. Analysera trades objektivt för att extrahera lärdomar.
 
 ANALYS-INSTRUKTIONER:
 1. Var hypotesen korrekt? Varför/varför inte?
@@ -731,33 +967,43 @@ ANALYS-INSTRUKTIONER:
 4. Vad kan vi lära oss för framtida trades?
 
 Svara med JSON:
-{{
+{
   "hypothesis_correct": true/false,
   "summary": "Kort sammanfattning av vad som hände",
   "missed_signals": ["Signal 1", "Signal 2"],
   "learning": "Konkret lärdom för framtiden (eller null om inget speciellt)",
   "category": "pattern/mistake/confirmation/timing",
   "confidence": 1-100
-}}"""
+}""",
+            "cache_control": {"type": "ephemeral"},
+        }]
 
         try:
-            response = self.claude_client.messages.create(
-                model="claude-sonnet-4-20250514",
+            # Stream the response so the request is not one long blocking
+            # read on slow generations
+            with self.claude_client.messages.stream(
+                model=model,
                 max_tokens=1000,
-                system="Du är en expert trading-analytiker. Analysera trades objektivt för att extrahera lärdomar.",
+                system=system_blocks,
                 messages=[{"role": "user", "content": prompt}]
-            )
-            
-            # Parse JSON response
-            raw_text = response.content[0].text
-            if raw_text.strip().startswith("```"):
-                # Remove code block formatting
-                lines = raw_text.split("\n")
-                raw_text = "\n".join(l for l in lines if not l.strip().startswith("```"))
-            
-            analysis = json.loads(raw_text.strip())
+            ) as stream:
+                raw_text = stream.get_final_text()
+            # Remove code block formatting
+            raw = raw_text.strip()
+            raw = raw.removeprefix("```json").removeprefix("```").removesuffix("```").strip()
+            analysis = _json_loads(raw)
+
+            try:
+                self.db.execute("""
+                    INSERT INTO claude_analysis_cache (prompt_hash, response)
+                    VALUES (%s, %s)
+                    ON CONFLICT (prompt_hash) DO NOTHING
+                """, (cache_key, _json_dumps(analysis)))
+            except Exception as e:
+                logger.debug(f"Claude cache write failed: {e}")
+
             return analysis
-            
+
         except Exception as e:
             logger.error(f"Claude analysis error: {e}")
             return None
@@ -772,134 +1018,148 @@ Svara med JSON:
         logger.info("📰 Running news research...")
         
         # Get our tracked companies
+        companies = self._get_companies()
+
+        # Each company's search is an independent network round-trip;
+        # fan them out and collect note rows as the searches finish
+        note_rows = []
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = {executor.submit(self._research_company, company): company
+                       for company in companies}
+            for future in as_completed(futures):
+                company = futures[future]
+                try:
+                    note_rows.extend(future.result())
+                except Exception as e:
+                    logger.error(f"News research error for {company['ticker']}: {e}")
+
+        # Flush all relevant notes in one INSERT round-trip
+        try:
+            self.db.execute_many("""
+                INSERT INTO research_notes
+                (ticker, topic, content, source, relevance_score, has_catalyst)
+                VALUES (:ticker, :topic, :content, :source, :relevance_score, :has_catalyst)
+                ON CONFLICT DO NOTHING
+            """, note_rows)
+        except Exception as e:
+            logger.error(f"Error saving research notes: {e}")
+            note_rows = []
+
+        # Look for upcoming catalysts in our existing news
+        try:
+            self._identify_catalysts()
+        except Exception as e:
+            logger.error(f"Catalyst identification error: {e}")
+
+        return {'research_notes_added': len(note_rows)}
+
+    def _get_companies(self) -> List[Dict]:
+        """Tracked companies, cached for COMPANIES_TTL between cycles."""
+        if self._companies_cache and time.time() - self._companies_cache[0] < self.COMPANIES_TTL:
+            return self._companies_cache[1]
+
         companies = self.db.query("SELECT ticker, name, sector FROM companies LIMIT 20")
-        
-        research_notes_added = 0
-        
-        for company in companies:
-            try:
-                if self.web_search:
-                    # Search for recent news about this company
-                    query = f"{company['name']} OR {company['ticker']} Sweden stock news"
-                    search_results = self.web_search(query, count=3, freshness='pw')  # Past week
-                    
-                    # Safely extract results with validation
-                    results = []
-                    if isinstance(search_results, dict) and 'web' in search_results:
-                        web_data = search_results['web']
-                        if isinstance(web_data, dict) and 'results' in web_data:
-                            raw_results = web_data['results']
-                            if isinstance(raw_results, list):
-                                # Ensure all results are dictionaries
-                                results = [r for r in raw_results if isinstance(r, dict)]
-                            else:
-                                logger.warning(f"Expected list but got {type(raw_results)} for {company['ticker']}")
-                        else:
-                            logger.warning(f"No 'results' in web data for {company['ticker']}")
+        self._companies_cache = (time.time(), companies)
+        return companies
+
+    def _research_company(self, company: Dict) -> List[Dict]:
+        """Search news for one company and return its relevant note rows."""
+        note_rows = []
+
+        # Lowercase once per company instead of once per news item
+        company = dict(company,
+                       ticker_lower=company['ticker'].lower(),
+                       name_lower=company['name'].lower())
+
+        if self.web_search:
+            # Search for recent news about this company
+            query = f"{company['name']} OR {company['ticker']} Sweden stock news"
+            search_results = self.web_search(query, count=3, freshness='pw')  # Past week
+
+            # Safely extract results with validation
+            results = []
+            if isinstance(search_results, dict) and 'web' in search_results:
+                web_data = search_results['web']
+                if isinstance(web_data, dict) and 'results' in web_data:
+                    raw_results = web_data['results']
+                    if isinstance(raw_results, list):
+                        # Ensure all results are dictionaries
+                        results = [r for r in raw_results if isinstance(r, dict)]
                     else:
-                        logger.warning(f"Unexpected search_results format for {company['ticker']}: {type(search_results)}")
-                    
-                    for result in results:
-                        # Analyze relevance and sentiment
-                        relevance = self._analyze_news_relevance(
-                            result['title'] + ' ' + result.get('snippet', ''),
-                            company
-                        )
-                        
-                        if relevance['score'] >= 60:  # Only save relevant news
-                            self.db.execute("""
-                                INSERT INTO research_notes 
-                                (ticker, topic, content, source, relevance_score)
-                                VALUES (%s, %s, %s, %s, %s)
-                                ON CONFLICT DO NOTHING
-                            """, (
-                                company['ticker'],
-                                result['title'],
-                                result.get('snippet', ''),
-                                result.get('url', 'web_search'),
-                                relevance['score']
-                            ))
-                            research_notes_added += 1
-                
-                # Look for upcoming catalysts in our existing news
-                self._identify_catalysts(company['ticker'])
-                
-            except Exception as e:
-                logger.error(f"News research error for {company['ticker']}: {e}")
-        
-        return {'research_notes_added': research_notes_added}
-    
-    def _analyze_news_relevance(self, content: str, company: Dict) -> Dict[str, Any]:
-        """Analyze how relevant a news item is for trading decisions."""
-        
+                        logger.warning(f"Expected list but got {type(raw_results)} for {company['ticker']}")
+                else:
+                    logger.warning(f"No 'results' in web data for {company['ticker']}")
+            else:
+                logger.warning(f"Unexpected search_results format for {company['ticker']}: {type(search_results)}")
+
+            for result in results:
+                # Analyze relevance and sentiment; lowercase once here so
+                # the scorer and keyword scans share one buffer
+                relevance = self._analyze_news_relevance(
+                    (result['title'] + ' ' + result.get('snippet', '')).lower(),
+                    company
+                )
+
+                if relevance['score'] >= 60:  # Only save relevant news
+                    snippet = result.get('snippet', '')
+                    note_rows.append({
+                        'ticker': company['ticker'],
+                        'topic': result['title'],
+                        'content': snippet,
+                        'source': result.get('url', 'web_search'),
+                        'relevance_score': relevance['score'],
+                        'has_catalyst': bool(_CATALYST_RE.search(snippet)),
+                    })
+
+        return note_rows
+
+    def _analyze_news_relevance(self, content_lower: str, company: Dict) -> Dict[str, Any]:
+        """Analyze how relevant a news item is for trading decisions.
+
+        content_lower is expected pre-lowercased by the caller.
+        """
         # Simple keyword-based relevance scoring
         score = 0
-        
-        content_lower = content.lower()
-        ticker_lower = company['ticker'].lower()
-        name_lower = company['name'].lower()
-        
-        # High relevance keywords
-        high_keywords = ['rapport', 'earnings', 'kvartalsrapport', 'q1', 'q2', 'q3', 'q4',
-                        'förvärv', 'acquisition', 'fusion', 'merger', 'avtal', 'contract',
-                        'order', 'beställning', 'lansering', 'launch']
-        
-        # Medium relevance keywords  
-        medium_keywords = ['kurs', 'aktie', 'stock', 'börsen', 'omxs', 'rekommendation',
-                          'analysdag', 'prognos', 'forecast', 'omsättning', 'vinst']
-        
+
+        ticker_lower = company.get('ticker_lower') or company['ticker'].lower()
+        name_lower = company.get('name_lower') or company['name'].lower()
+
         # Check for company mentions
         if ticker_lower in content_lower:
             score += 30
         if name_lower in content_lower:
             score += 20
-        
-        # Check for relevant keywords
-        for keyword in high_keywords:
-            if keyword in content_lower:
-                score += 25
-        
-        for keyword in medium_keywords:
-            if keyword in content_lower:
-                score += 10
-        
-        # Sector relevance
-        if company.get('sector'):
-            sector_keywords = {
-                'industrials': ['industri', 'manufacturing', 'verkstad'],
-                'technology': ['tech', 'mjukvara', 'software', 'ai', 'digital'],
-                'basic materials': ['stål', 'steel', 'mining', 'gruv', 'råvara'],
-            }
-            
-            sector_key = company['sector'].lower()
-            if sector_key in sector_keywords:
-                for keyword in sector_keywords[sector_key]:
-                    if keyword in content_lower:
-                        score += 15
-        
+
+        # Relevance and sector keywords, each counted once, in one
+        # compiled-regex pass over the merged table for this sector
+        sector_key = (company.get('sector') or '').lower()
+        weights = _SECTOR_KEYWORD_WEIGHTS.get(sector_key, _NEWS_KEYWORD_WEIGHTS)
+        pattern = _SECTOR_KEYWORD_RES.get(sector_key, _NEWS_KEYWORD_RE)
+        for keyword in set(pattern.findall(content_lower)):
+            score += weights[keyword]
+
         return {
             'score': min(100, score),
             'high_relevance': score >= 70
         }
     
-    def _identify_catalysts(self, ticker: str):
-        """Identify upcoming catalysts from research notes."""
-        
-        # Look for catalyst-indicating content in recent research notes
-        catalyst_notes = self.db.query("""
-            SELECT topic, content FROM research_notes
-            WHERE ticker = :ticker 
+    def _identify_catalysts(self):
+        """Identify upcoming catalysts from research notes.
+
+        Notes are tagged with has_catalyst when inserted, so this is one
+        aggregate over the flag instead of per-ticker LIKE scans.
+        """
+        catalyst_counts = self.db.query("""
+            SELECT ticker, COUNT(*) as note_count FROM research_notes
+            WHERE has_catalyst
             AND created_at >= CURRENT_DATE - INTERVAL '7 days'
-            AND (LOWER(content) LIKE '%%rapport%%' 
-                 OR LOWER(content) LIKE '%%lansering%%'
-                 OR LOWER(content) LIKE '%%contract%%'
-                 OR LOWER(content) LIKE '%%avtal%%')
-        """, {'ticker': ticker})
-        
+            GROUP BY ticker
+        """)
+
         # This could be enhanced with NLP to extract specific dates and events
         # For now, just flag that catalysts exist
-        if catalyst_notes:
-            logger.info(f"📅 {ticker}: {len(catalyst_notes)} potential catalysts identified")
+        for row in catalyst_counts:
+            logger.info(f"📅 {row['ticker']}: {row['note_count']} potential catalysts identified")
     
     # ==================== STUDY MODULE 5: STRATEGY EVOLUTION ====================
     
@@ -913,86 +1173,98 @@ Svara med JSON:
         # Analyze trade patterns from the last 6 months
         trade_analysis = self._analyze_trade_patterns()
         
-        insights_added = 0
-        
         # Generate insights from the analysis
         insights = self._generate_strategy_insights(trade_analysis)
-        
-        for insight in insights:
-            try:
-                self.db.execute("""
-                    INSERT INTO strategy_insights (insight_type, content, confidence, evidence)
-                    VALUES (%s, %s, %s, %s)
-                """, (
-                    insight['type'],
-                    insight['content'],
-                    insight['confidence'],
-                    insight['evidence']
-                ))
-                insights_added += 1
-                
+
+        # Flush all insights in one INSERT round-trip
+        insights_added = 0
+        try:
+            self.db.execute_many("""
+                INSERT INTO strategy_insights (insight_type, content, confidence, evidence)
+                VALUES (:type, :content, :confidence, :evidence)
+            """, insights)
+            insights_added = len(insights)
+
+            for insight in insights:
                 logger.info(f"💡 Strategy insight: {insight['content']}")
-                
-            except Exception as e:
-                logger.error(f"Error saving strategy insight: {e}")
-        
+
+        except Exception as e:
+            logger.error(f"Error saving strategy insights: {e}")
+
         return {'insights_added': insights_added}
     
     def _analyze_trade_patterns(self) -> Dict[str, Any]:
         """Analyze patterns in our trading history."""
-        
-        # Sector performance
-        sector_performance = self.db.query("""
-            SELECT c.sector, 
-                   COUNT(t.id) as trade_count,
-                   AVG(CASE WHEN t.pnl IS NOT NULL THEN t.pnl ELSE 0 END) as avg_pnl,
-                   AVG(CASE WHEN t.confidence IS NOT NULL THEN t.confidence ELSE 0 END) as avg_confidence,
-                   SUM(CASE WHEN t.pnl > 0 THEN 1 ELSE 0 END)::float / COUNT(t.id) * 100 as win_rate
-            FROM trades t
-            JOIN companies c ON c.ticker = t.ticker
-            WHERE t.executed_at >= CURRENT_DATE - INTERVAL '6 months'
-            GROUP BY c.sector
-            HAVING COUNT(t.id) >= 3
-            ORDER BY avg_pnl DESC
-        """)
-        
-        # Time-based performance
-        time_performance = self.db.query("""
-            SELECT EXTRACT(HOUR FROM executed_at) as hour,
-                   COUNT(*) as trade_count,
-                   AVG(CASE WHEN pnl IS NOT NULL THEN pnl ELSE 0 END) as avg_pnl,
-                   SUM(CASE WHEN pnl > 0 THEN 1 ELSE 0 END)::float / COUNT(*) * 100 as win_rate
-            FROM trades
-            WHERE executed_at >= CURRENT_DATE - INTERVAL '6 months'
-            GROUP BY EXTRACT(HOUR FROM executed_at)
-            HAVING COUNT(*) >= 3
-            ORDER BY avg_pnl DESC
-        """)
-        
-        # Confidence vs performance correlation
-        confidence_analysis = self.db.query("""
-            SELECT 
-                CASE 
-                    WHEN confidence >= 80 THEN '80-100'
-                    WHEN confidence >= 70 THEN '70-79'
-                    WHEN confidence >= 60 THEN '60-69'
-                    ELSE '50-59'
-                END as confidence_range,
-                COUNT(*) as trade_count,
-                AVG(CASE WHEN pnl IS NOT NULL THEN pnl ELSE 0 END) as avg_pnl,
-                SUM(CASE WHEN pnl > 0 THEN 1 ELSE 0 END)::float / COUNT(*) * 100 as win_rate
-            FROM trades
-            WHERE executed_at >= CURRENT_DATE - INTERVAL '6 months'
-            AND confidence IS NOT NULL
-            GROUP BY confidence_range
-            ORDER BY avg_pnl DESC
+
+        # One round-trip: the 6-month trade window is scanned once in the
+        # recent CTE and the three aggregations all read from it, returned
+        # as JSON arrays (same shape as the brain's snapshot query)
+        rows = self.db.query("""
+            WITH recent AS (
+                SELECT t.id, t.executed_at, t.pnl, t.confidence, c.sector
+                FROM trades t
+                JOIN companies c ON c.ticker = t.ticker
+                WHERE t.executed_at >= CURRENT_DATE - INTERVAL '6 months'
+            ),
+            sector_perf AS (
+                SELECT sector,
+                       COUNT(id) as trade_count,
+                       AVG(COALESCE(pnl, 0)) as avg_pnl,
+                       AVG(COALESCE(confidence, 0)) as avg_confidence,
+                       AVG((COALESCE(pnl, 0) > 0)::int) * 100 as win_rate
+                FROM recent
+                GROUP BY sector
+                HAVING COUNT(id) >= 3
+            ),
+            sector_ranked AS (
+                SELECT s.*,
+                       ROW_NUMBER() OVER (ORDER BY avg_pnl DESC) AS rn_desc,
+                       ROW_NUMBER() OVER (ORDER BY avg_pnl ASC) AS rn_asc
+                FROM sector_perf s
+            ),
+            time_perf AS (
+                SELECT EXTRACT(HOUR FROM executed_at) as hour,
+                       COUNT(*) as trade_count,
+                       AVG(COALESCE(pnl, 0)) as avg_pnl,
+                       AVG((COALESCE(pnl, 0) > 0)::int) * 100 as win_rate
+                FROM recent
+                GROUP BY EXTRACT(HOUR FROM executed_at)
+                HAVING COUNT(*) >= 3
+            ),
+            confidence_perf AS (
+                SELECT
+                    CASE
+                        WHEN confidence >= 80 THEN '80-100'
+                        WHEN confidence >= 70 THEN '70-79'
+                        WHEN confidence >= 60 THEN '60-69'
+                        ELSE '50-59'
+                    END as confidence_range,
+                    COUNT(*) as trade_count,
+                    AVG(COALESCE(pnl, 0)) as avg_pnl,
+                    AVG((COALESCE(pnl, 0) > 0)::int) * 100 as win_rate
+                FROM recent
+                WHERE confidence IS NOT NULL
+                GROUP BY confidence_range
+            )
+            SELECT json_build_object(
+                'sector_performance',
+                -- Only the best and worst sectors are consumed downstream,
+                -- so just those two rows cross the wire
+                (SELECT COALESCE(json_agg(row_to_json(sr) ORDER BY sr.avg_pnl DESC), '[]'::json)
+                 FROM sector_ranked sr WHERE sr.rn_desc = 1 OR sr.rn_asc = 1),
+                'time_performance',
+                (SELECT COALESCE(json_agg(row_to_json(t) ORDER BY t.avg_pnl DESC), '[]'::json)
+                 FROM time_perf t),
+                'confidence_analysis',
+                (SELECT COALESCE(json_agg(row_to_json(cp) ORDER BY cp.avg_pnl DESC), '[]'::json)
+                 FROM confidence_perf cp)
+            ) AS analysis
         """)
-        
-        return {
-            'sector_performance': sector_performance,
-            'time_performance': time_performance,
-            'confidence_analysis': confidence_analysis
-        }
+
+        analysis = rows[0]['analysis']
+        if isinstance(analysis, str):
+            analysis = _json_loads(analysis)
+        return analysis
     
     def _generate_strategy_insights(self, analysis: Dict[str, Any]) -> List[Dict]:
         """Generate actionable strategy insights from trade analysis."""
@@ -1070,30 +1342,42 @@ Svara med JSON:
             "Nordic trading volume patterns"
         ]
         
-        for topic in research_topics[:3]:  # Limit to 3 topics per cycle
-            try:
-                results = self.web_search(topic, count=5, freshness='pm')  # Past month
-                
-                for result in results.get('web', {}).get('results', []):
-                    insight = self._extract_trading_insight(result, topic)
-                    if insight:
-                        # Save insight
-                        self.db.execute("""
-                            INSERT INTO strategy_insights (insight_type, content, confidence, evidence)
-                            VALUES (%s, %s, %s, %s)
-                        """, (
-                            'external_research',
-                            insight['content'],
-                            insight['confidence'],
-                            f"Source: {result.get('title', 'External research')}"
-                        ))
-                        insights_added += 1
-                        
-                        logger.info(f"📚 External insight: {insight['content'][:80]}...")
-                
-            except Exception as e:
-                logger.error(f"Self-study error for topic '{topic}': {e}")
-        
+        # The topic searches are independent network round-trips — run
+        # them concurrently and extract insights as they come back
+        cycle_topics = research_topics[:3]  # Limit to 3 topics per cycle
+        insight_rows = []
+        with ThreadPoolExecutor(max_workers=len(cycle_topics)) as executor:
+            futures = [(topic, executor.submit(self.web_search, topic, count=5, freshness='pm'))  # Past month
+                       for topic in cycle_topics]
+            for topic, future in futures:
+                try:
+                    results = future.result()
+
+                    for result in results.get('web', {}).get('results', []):
+                        insight = self._extract_trading_insight(result, topic)
+                        if insight:
+                            insight_rows.append({
+                                'type': 'external_research',
+                                'content': insight['content'],
+                                'confidence': insight['confidence'],
+                                'evidence': f"Source: {result.get('title', 'External research')}"
+                            })
+
+                            logger.info(f"📚 External insight: {insight['content'][:80]}...")
+
+                except Exception as e:
+                    logger.error(f"Self-study error for topic '{topic}': {e}")
+
+        # Flush all insights in one INSERT round-trip
+        try:
+            self.db.execute_many("""
+                INSERT INTO strategy_insights (insight_type, content, confidence, evidence)
+                VALUES (:type, :content, :confidence, :evidence)
+            """, insight_rows)
+            insights_added = len(insight_rows)
+        except Exception as e:
+            logger.error(f"Error saving self-study insights: {e}")
+
         return {'insights_added': insights_added}
     
     def _extract_trading_insight(self, search_result: Dict, topic: str) -> Optional[Dict]:
@@ -1102,44 +1386,15 @@ Svara med JSON:
         title = search_result.get('title', '')
         snippet = search_result.get('snippet', '')
         content = (title + ' ' + snippet).lower()
-        
-        # Look for actionable patterns or insights
-        insights = []
-        
-        # Pattern: Friday effect
-        if 'friday' in content and ('effect' in content or 'pattern' in content):
-            insights.append({
-                'content': f"OMX Friday-mönster identifierat: {snippet[:100]}...",
-                'confidence': 60,
-                'type': 'timing_pattern'
-            })
-        
-        # Pattern: Sector rotation
-        if 'sector' in content and ('rotation' in content or 'outperform' in content):
-            insights.append({
-                'content': f"Sektorrotation på OMX: {snippet[:100]}...", 
-                'confidence': 65,
-                'type': 'sector_pattern'
-            })
-        
-        # Pattern: Seasonality
-        if any(month in content for month in ['january', 'december', 'q1', 'q4']) and 'effect' in content:
-            insights.append({
-                'content': f"Säsongseffekt identifierad: {snippet[:100]}...",
-                'confidence': 70,
-                'type': 'seasonal_pattern'
-            })
-        
-        # Pattern: Volume/momentum
-        if 'momentum' in content and ('volume' in content or 'breakout' in content):
-            insights.append({
-                'content': f"OMX momentum-strategi: {snippet[:100]}...",
-                'confidence': 75,
-                'type': 'momentum_pattern'
-            })
-        
-        # Return the highest confidence insight
-        if insights:
-            return max(insights, key=lambda x: x['confidence'])
-        
-        return None
\ No newline at end of file
+
+        # One compiled pass; the matched group name says which pattern hit
+        match = _INSIGHT_PATTERNS.match(content)
+        if not match:
+            return None
+
+        template, confidence = _INSIGHT_TEMPLATES[match.lastgroup]
+        return {
+            'content': template.format(snippet[:100]),
+            'confidence': confidence,
+            'type': match.lastgroup
+        }
\ No newline at end of file
@@ -8,24 +8,53 @@ Handles paper trading simulation:
 - Extracts learnings
 """
 
+import json
 import logging
+import time
+from itertools import islice
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 from decimal import Decimal
+import numpy as np
+import pandas as pd
 from .notifier import TelegramNotifier
 
 logger = logging.getLogger(__name__)
 
+# Opportunity fields with their defaults, merged once per trade instead
+# of a dict.get dispatch per field
+_OPP_DEFAULTS = {
+    'action': 'BUY',
+    'position_size': 2000,
+    'hypothesis': None,
+    'confidence': None,
+    'reasoning': None,
+    'thesis': 'Autonom handel',
+    'macro_context': {},
+    'impacts': [],
+}
+
+# Hypothesis templates, built once instead of per trade
+_HYP_WITH_TRIGGERS = "Förväntar +5-10% inom 2 veckor. Triggers: {}"
+_HYP_DEFAULT = "Förväntar +5-10% inom 2 veckor baserat på sektoranalys och momentum"
+
 
 class PaperTrader:
     """Simulated paper trading engine."""
-    
+
+    STARTING_CAPITAL = 20000  # SEK
+    PORTFOLIO_VALUE_TTL = 60  # seconds; pollers re-read the same valuation
+
     def __init__(self, db):
         self.db = db
         self.notifier = TelegramNotifier()
-        
+        self._pv_cache: Optional[tuple] = None  # (timestamp, value dict)
+
     def get_portfolio_value(self) -> Dict[str, Any]:
-        """Calculate current portfolio value."""
+        """Calculate current portfolio value (cached briefly between trades)."""
+        if self._pv_cache and time.time() - self._pv_cache[0] < self.PORTFOLIO_VALUE_TTL:
+            return self._pv_cache[1]
+
         balance = self.db.get_balance()
         portfolio = self.db.get_portfolio()
         
@@ -33,72 +62,73 @@ class PaperTrader:
         positions_value = 0
         
         if not portfolio.empty:
-            # Get latest prices for positions
+            # Get latest prices for positions and value them in one
+            # merge + vectorized multiply instead of a per-row scan
             tickers = portfolio['ticker'].tolist()
             prices = self.db.get_latest_prices(tickers)
-            
-            for _, pos in portfolio.iterrows():
-                ticker = pos['ticker']
-                price_row = prices[prices['ticker'] == ticker]
-                if not price_row.empty:
-                    current_price = float(price_row.iloc[0]['close'])
-                    positions_value += float(pos['shares']) * current_price
+
+            merged = portfolio.merge(prices[['ticker', 'close']], on='ticker', how='left')
+            merged['close'] = merged['close'].astype('float64').fillna(0.0)
+            positions_value = float((merged['shares'].astype('float64') * merged['close']).sum())
         
         total_value = cash + positions_value
-        
-        return {
+
+        value = {
             'cash': cash,
             'positions_value': positions_value,
             'total_value': total_value,
-            'pnl': total_value - 20000,  # Starting capital
-            'pnl_pct': ((total_value / 20000) - 1) * 100,
+            'pnl': total_value - self.STARTING_CAPITAL,
+            'pnl_pct': ((total_value / self.STARTING_CAPITAL) - 1) * 100,
         }
+        self._pv_cache = (time.time(), value)
+        return value
     
-    def execute_trade(self, opportunity: Dict[str, Any]) -> bool:
-        """
-        Execute a paper trade.
-        
-        opportunity = {
-            'ticker': 'VOLV-B',
-            'action': 'BUY',
-            'reasoning': 'Stålpriser ner, bättre marginaler',
-            'confidence': 75,
-            'hypothesis': 'Kursen stiger 5-10% inom 2 veckor',
-            'position_size': 2000,  # SEK
-        }
+    def _prepare_trade(self, opportunity: Dict[str, Any],
+                       price_cache: Optional[Dict[str, float]] = None,
+                       cash_available: Optional[float] = None) -> Optional[Dict]:
+        """Validate an opportunity and build its trade dict, without writing.
+
+        price_cache and cash_available let auto_trade prefetch prices and
+        the balance once for a batch instead of per call. Returns None when
+        the trade can't be taken.
         """
-        ticker = opportunity['ticker']
-        action = opportunity.get('action', 'BUY')
-        position_size = opportunity.get('position_size', 2000)
-        
-        # Get current price
-        prices = self.db.get_latest_prices([ticker])
-        if prices.empty:
+        opp = {**_OPP_DEFAULTS, **opportunity}
+        ticker = opp['ticker']
+        action = opp['action']
+        position_size = opp['position_size']
+
+        # Get current price (from the batch cache when provided)
+        if price_cache is not None:
+            current_price = price_cache.get(ticker)
+        else:
+            prices = self.db.get_latest_prices([ticker])
+            current_price = float(prices.iloc[0]['close']) if not prices.empty else None
+        if current_price is None:
             logger.error(f"No price data for {ticker}")
-            return False
-            
-        current_price = float(prices.iloc[0]['close'])
+            return None
+
         shares = position_size / current_price
-        
+
         # Check we have enough cash for buys
         if action == 'BUY':
-            balance = self.db.get_balance()
-            if balance['cash'] < position_size:
-                logger.warning(f"Insufficient cash for {ticker}: need {position_size}, have {balance['cash']}")
-                return False
+            cash = cash_available if cash_available is not None else self.db.get_balance()['cash']
+            if cash < position_size:
+                logger.warning(f"Insufficient cash for {ticker}: need {position_size}, have {cash}")
+                return None
         
         # Generate hypothesis if not provided
-        hypothesis = opportunity.get('hypothesis')
+        hypothesis = opp['hypothesis']
         if not hypothesis:
             # Build specific hypothesis from impacts
-            impacts = opportunity.get('impacts', [])
-            positive_factors = [i['reason'] for i in impacts if i.get('direction') == 'positive']
-            
+            impacts = opp['impacts']
+            # Only the first two positive factors are used, so stop scanning there
+            positive_factors = list(islice(
+                (i['reason'] for i in impacts if i.get('direction') == 'positive'), 2))
+
             if positive_factors:
-                factors_text = ', '.join(positive_factors[:2])
-                hypothesis = f"Förväntar +5-10% inom 2 veckor. Triggers: {factors_text}"
+                hypothesis = _HYP_WITH_TRIGGERS.format(', '.join(positive_factors))
             else:
-                hypothesis = f"Förväntar +5-10% inom 2 veckor baserat på sektoranalys och momentum"
+                hypothesis = _HYP_DEFAULT
         
         # Calculate target and stop-loss
         target_pct = 10  # +10% target
@@ -106,33 +136,53 @@ class PaperTrader:
         target_price = current_price * (1 + target_pct / 100)
         stop_loss_price = current_price * (1 + stop_loss_pct / 100)
         
-        # Log the trade
         trade = {
             'ticker': ticker,
             'action': action,
             'shares': shares,
             'price': current_price,
             'total_value': position_size,
-            'reasoning': opportunity.get('reasoning', opportunity.get('thesis', 'Autonom handel')),
-            'confidence': opportunity.get('confidence'),
+            'reasoning': opp['reasoning'] if opp['reasoning'] is not None else opp['thesis'],
+            'confidence': opp['confidence'],
             'hypothesis': hypothesis,
-            'macro_context': opportunity.get('macro_context', {}),
+            'macro_context': opp['macro_context'],
             'target_price': target_price,
             'stop_loss': stop_loss_price,
             'target_pct': target_pct,
             'stop_loss_pct': stop_loss_pct,
         }
         
+        logger.info("   📈 Target: %.2f (+%s%%) | 📉 Stop-loss: %.2f (%s%%)", target_price, target_pct, stop_loss_price, stop_loss_pct)
+
+        logger.info("🤖 AGENT TRADE: %s %.2f %s @ %.2f SEK", action, shares, ticker, current_price)
+        logger.info("   Confidence: %s%%", opp['confidence'] if opp['confidence'] is not None else 'N/A')
+        logger.info("   Reasoning: %.100s...", trade['reasoning'])
+
+        return trade
+
+    def execute_trade(self, opportunity: Dict[str, Any],
+                      price_cache: Optional[Dict[str, float]] = None,
+                      cash_available: Optional[float] = None) -> bool:
+        """
+        Execute a paper trade.
+
+        opportunity = {
+            'ticker': 'VOLV-B',
+            'action': 'BUY',
+            'reasoning': 'Stålpriser ner, bättre marginaler',
+            'confidence': 75,
+            'hypothesis': 'Kursen stiger 5-10% inom 2 veckor',
+            'position_size': 2000,  # SEK
+        }
+        """
+        trade = self._prepare_trade(opportunity, price_cache, cash_available)
+        if trade is None:
+            return False
+
         self.db.log_trade(trade)
-        
-        logger.info(f"   📈 Target: {target_price:.2f} (+{target_pct}%) | 📉 Stop-loss: {stop_loss_price:.2f} ({stop_loss_pct}%)")
-        
-        logger.info(f"🤖 AGENT TRADE: {action} {shares:.2f} {ticker} @ {current_price:.2f} SEK")
-        logger.info(f"   Confidence: {opportunity.get('confidence', 'N/A')}%")
-        logger.info(f"   Reasoning: {trade['reasoning'][:100]}...")
-        
+        self._pv_cache = None  # position set changed
         return True
-    
+
     def auto_trade(self, opportunities: List[Dict], min_confidence: float = 65, max_positions: int = 5, position_size: float = 2000) -> List[Dict]:
         """
         Autonomous trading based on opportunities.
@@ -144,39 +194,80 @@ class PaperTrader:
         - Don't buy same stock twice
         """
         executed = []
-        
-        # Get current positions
+
+        # Get current positions; pull the column once as an array
         portfolio = self.db.get_portfolio()
-        current_tickers = set(portfolio['ticker'].tolist()) if not portfolio.empty else set()
-        num_positions = len(current_tickers)
-        
-        # Filter and sort opportunities
-        tradeable = [
-            o for o in opportunities 
-            if o['confidence'] >= min_confidence 
-            and o['ticker'] not in current_tickers
-        ]
-        tradeable.sort(key=lambda x: x['confidence'], reverse=True)
-        
-        # Execute trades
+        tickers_arr = portfolio['ticker'].to_numpy() if not portfolio.empty else np.empty(0, dtype=object)
+        current_tickers = set(tickers_arr.tolist())
+        num_positions = tickers_arr.size
+
+        # A full portfolio means no candidate work at all
+        open_slots = max_positions - num_positions
+        if open_slots <= 0:
+            logger.info(f"Max positions ({max_positions}) reached, no trades possible")
+            return []
+
+        # Filter columnar: confidence mask + ticker.isin run in C whether
+        # the caller passed a DataFrame or a list of dicts
+        df = opportunities if isinstance(opportunities, pd.DataFrame) else pd.DataFrame(opportunities)
+        if df.empty:
+            candidates = pd.DataFrame()
+        else:
+            mask = (df['confidence'] >= min_confidence) & ~df['ticker'].isin(current_tickers)
+            candidates = df.loc[mask]
+
+        # Prefetch all candidate prices and the balance once, then keep
+        # only the top candidates by confidence that actually have a
+        # price — a partial top-k select instead of a full sort, and no
+        # fill can fail on missing data afterwards
+        price_cache: Dict[str, float] = {}
+        cash_remaining = 0.0
+        tradeable: List[Dict] = []
+        if not candidates.empty:
+            prices = self.db.get_latest_prices(candidates['ticker'].unique().tolist())
+            if not prices.empty:
+                price_cache = prices.set_index('ticker')['close'].astype(float).to_dict()
+            candidates = candidates[candidates['ticker'].isin(price_cache)]
+            # The DataFrame lift fills keys absent from some opportunity
+            # dicts with NaN; drop those so _prepare_trade's defaults
+            # apply as if the key were never there
+            tradeable = [
+                {k: v for k, v in rec.items() if not (np.isscalar(v) and pd.isna(v))}
+                for rec in candidates.nlargest(open_slots, 'confidence').to_dict('records')
+            ]
+            cash_remaining = float(self.db.get_balance()['cash'])
+
+        # Prepare trades, then flush them as one multi-row write
+        pending = []
         for opp in tradeable:
-            if num_positions >= max_positions:
-                logger.info(f"Max positions ({max_positions}) reached, skipping {opp['ticker']}")
+            if cash_remaining < position_size:
+                logger.info(f"Insufficient cash for further trades ({cash_remaining:.0f} SEK left)")
                 break
-            
+
             opp['position_size'] = position_size
             opp['action'] = 'BUY'
-            
-            if self.execute_trade(opp):
+
+            trade = self._prepare_trade(opp, price_cache=price_cache, cash_available=cash_remaining)
+            if trade is not None:
+                pending.append(trade)
                 executed.append(opp)
                 num_positions += 1
-                logger.info(f"✅ Executed: {opp['ticker']} @ {opp['confidence']:.0f}% confidence")
-        
+                cash_remaining -= position_size
+                logger.info("✅ Executed: %s @ %.0f%% confidence", opp['ticker'], opp['confidence'])
+
+        if pending:
+            try:
+                self.db.log_trades(pending)
+                self._pv_cache = None  # position set changed
+            except Exception as e:
+                logger.error(f"Error logging trades: {e}")
+                return []
+
         if executed:
             logger.info(f"🤖 Agent executed {len(executed)} trades")
         else:
             logger.info(f"🤖 No trades executed (min confidence: {min_confidence}%)")
-        
+
         return executed
     
     def _execute_auto_sell(self, ticker: str, shares: float, current_price: float, reason: str):
@@ -198,34 +289,40 @@ class PaperTrader:
                 'stop_loss_pct': 0,
             }
             self.db.log_trade(trade)
-            logger.info(f"✅ AUTO-SELL executed: {shares:.2f} {ticker} @ {current_price:.2f} SEK")
+            self._pv_cache = None  # position set changed
+            logger.info("✅ AUTO-SELL executed: %.2f %s @ %.2f SEK", shares, ticker, current_price)
         except Exception as e:
             logger.error(f"Error executing auto-sell for {ticker}: {e}")
     
-    def _update_trailing_stop(self, ticker: str, avg_price: float, current_pnl_pct: float):
-        """Update trailing stop-loss in trades table."""
+    def _update_trailing_stops_bulk(self, updates: List[tuple]):
+        """Update trailing stop-losses for (ticker, new_stop) pairs in one statement."""
+        if not updates:
+            return
         try:
-            # New stop-loss at +2% from entry price
-            new_stop_loss = avg_price * 1.02
-            
-            # Update the most recent open trade for this ticker using subquery
+            tickers = [t for t, _ in updates]
+            new_stops = [s for _, s in updates]
+
+            # Unnest the pairs server-side so all trailing stops move in a
+            # single round-trip; each ticker's most recent open BUY is hit
             self.db.execute("""
-                UPDATE trades SET 
-                    stop_loss = %s,
+                UPDATE trades t SET
+                    stop_loss = v.new_stop,
                     stop_loss_pct = 2.0
-                WHERE id = (
-                    SELECT id FROM trades 
-                    WHERE ticker = %s 
-                    AND closed_at IS NULL 
+                FROM (SELECT unnest(%s) AS ticker, unnest(%s) AS new_stop) v
+                WHERE t.id = (
+                    SELECT id FROM trades
+                    WHERE ticker = v.ticker
+                    AND closed_at IS NULL
                     AND action = 'BUY'
-                    ORDER BY executed_at DESC 
+                    ORDER BY executed_at DESC
                     LIMIT 1
                 )
-            """, (new_stop_loss, ticker))
-            
-            logger.info(f"📈 {ticker}: Trailing stop updated to +2% ({new_stop_loss:.2f} SEK)")
+            """, (tickers, new_stops))
+
+            for ticker, new_stop in updates:
+                logger.info("📈 %s: Trailing stop updated to +2%% (%.2f SEK)", ticker, new_stop)
         except Exception as e:
-            logger.error(f"Error updating trailing stop for {ticker}: {e}")
+            logger.error(f"Error updating trailing stops: {e}")
     
     def check_positions(self):
         """Check current positions for stop-loss or take-profit."""
@@ -234,37 +331,48 @@ class PaperTrader:
         if portfolio.empty:
             logger.info("No open positions")
             return
-        
-        for _, pos in portfolio.iterrows():
-            ticker = pos['ticker']
-            shares = float(pos['shares'])
-            avg_price = float(pos['avg_price'])
-            
-            # Get current price
-            prices = self.db.get_latest_prices([ticker])
-            if prices.empty:
-                continue
-                
-            current_price = float(prices.iloc[0]['close'])
-            pnl_pct = ((current_price / avg_price) - 1) * 100
-            
-            # Check stop-loss (-5%) - EXECUTE ACTUAL SELL
-            if pnl_pct <= -5:
-                logger.warning(f"🔴 {ticker}: Stop-loss triggered ({pnl_pct:.1f}%) - EXECUTING SELL")
-                self._execute_auto_sell(ticker, shares, current_price, "Stop-loss triggered")
-                self.notifier.notify_auto_sell(ticker, shares, current_price, "Stop-loss triggered", pnl_pct)
-                
-            # Check take-profit (+10%) - EXECUTE ACTUAL SELL  
-            elif pnl_pct >= 10:
-                logger.info(f"🟢 {ticker}: Take-profit triggered ({pnl_pct:.1f}%) - EXECUTING SELL")
-                self._execute_auto_sell(ticker, shares, current_price, "Take-profit triggered")
-                self.notifier.notify_auto_sell(ticker, shares, current_price, "Take-profit triggered", pnl_pct)
-                
-            # Implement trailing stop: vid +5%, flytta stop-loss till +2%
-            elif pnl_pct >= 5:
-                logger.info(f"📈 {ticker}: Trailing stop activated at +{pnl_pct:.1f}% - monitoring for +2% floor")
-                # Check if we should update stop loss in trades table
-                self._update_trailing_stop(ticker, avg_price, pnl_pct)
+
+        # One price fetch for the whole portfolio, pnl as a vector, then
+        # iterate only the (typically tiny) subsets that need action
+        tickers = portfolio['ticker'].tolist()
+        prices = self.db.get_latest_prices(tickers)
+        if prices.empty:
+            return
+
+        m = portfolio.merge(prices[['ticker', 'close']], on='ticker')
+        # Cast the numeric columns once so the action loops below do
+        # plain attribute access instead of per-row Decimal unboxing
+        m[['shares', 'avg_price', 'close']] = m[['shares', 'avg_price', 'close']].astype('float64')
+        m['pnl_pct'] = (m['close'] / m['avg_price'] - 1) * 100
+
+        stops = m[m['pnl_pct'] <= -5]
+        take_profits = m[m['pnl_pct'] >= 10]
+        trailing = m[(m['pnl_pct'] >= 5) & (m['pnl_pct'] < 10)]
+
+        # Stop-loss (-5%) - EXECUTE ACTUAL SELL
+        for pos in stops.itertuples(index=False):
+            ticker, shares = pos.ticker, pos.shares
+            current_price, pnl_pct = pos.close, pos.pnl_pct
+            logger.warning("🔴 %s: Stop-loss triggered (%.1f%%) - EXECUTING SELL", ticker, pnl_pct)
+            self._execute_auto_sell(ticker, shares, current_price, "Stop-loss triggered")
+            self.notifier.notify_auto_sell(ticker, shares, current_price, "Stop-loss triggered", pnl_pct)
+
+        # Take-profit (+10%) - EXECUTE ACTUAL SELL
+        for pos in take_profits.itertuples(index=False):
+            ticker, shares = pos.ticker, pos.shares
+            current_price, pnl_pct = pos.close, pos.pnl_pct
+            logger.info("🟢 %s: Take-profit triggered (%.1f%%) - EXECUTING SELL", ticker, pnl_pct)
+            self._execute_auto_sell(ticker, shares, current_price, "Take-profit triggered")
+            self.notifier.notify_auto_sell(ticker, shares, current_price, "Take-profit triggered", pnl_pct)
+
+        # Trailing stop: vid +5%, flytta stop-loss till +2% — collect the
+        # new stops and write them all in one UPDATE
+        trailing_updates = []
+        for pos in trailing.itertuples(index=False):
+            ticker, pnl_pct = pos.ticker, pos.pnl_pct
+            logger.info("📈 %s: Trailing stop activated at +%.1f%% - monitoring for +2%% floor", ticker, pnl_pct)
+            trailing_updates.append((ticker, pos.avg_price * 1.02))
+        self._update_trailing_stops_bulk(trailing_updates)
     
     def log_daily_performance(self):
         """Log end of day performance."""
@@ -280,19 +388,17 @@ class PaperTrader:
         """Record a trade outcome checkpoint in trade_outcomes table."""
         from datetime import date as date_type
         try:
-            # Get trade date
+            # Let the database compute the age; avoids re-parsing the
+            # timestamp in Python
             trades = self.db.query(
-                "SELECT executed_at FROM trades WHERE id = :id",
+                "SELECT EXTRACT(DAY FROM NOW() - executed_at)::int AS days_since "
+                "FROM trades WHERE id = :id",
                 {'id': trade_id}
             )
             if not trades:
                 return
-            
-            trade_date = trades[0]['executed_at']
-            if isinstance(trade_date, str):
-                trade_date = datetime.fromisoformat(trade_date.replace('Z', '+00:00'))
-            
-            days_since = (datetime.now() - trade_date.replace(tzinfo=None)).days
+
+            days_since = trades[0]['days_since']
             pnl_pct = ((current_price / entry_price) - 1) * 100
             pnl_amount = (current_price - entry_price) * shares
             
@@ -317,43 +423,52 @@ class PaperTrader:
         week_start = (datetime.now() - timedelta(days=7)).date()
         week_end = datetime.now().date()
         
-        # Get this week's trades
+        # Aggregate the week in the database: totals, sector breakdown
+        # and best/worst trade come back as one JSON row instead of
+        # every trade crossing the wire for Python loops
         try:
-            week_trades = self.db.query("""
-                SELECT * FROM trades 
-                WHERE executed_at >= :start
-                ORDER BY executed_at
+            rows = self.db.query("""
+                WITH w AS (
+                    SELECT t.ticker, COALESCE(t.pnl, 0) AS pnl, c.sector
+                    FROM trades t
+                    LEFT JOIN companies c ON c.ticker = t.ticker
+                    WHERE t.executed_at >= :start
+                )
+                SELECT json_build_object(
+                    'total', (SELECT COUNT(*) FROM w),
+                    'winning', (SELECT COUNT(*) FILTER (WHERE pnl > 0) FROM w),
+                    'losing', (SELECT COUNT(*) FILTER (WHERE pnl < 0) FROM w),
+                    'total_pnl', (SELECT COALESCE(SUM(pnl), 0) FROM w),
+                    'sectors', (SELECT COALESCE(json_agg(row_to_json(s)), '[]'::json)
+                                FROM (SELECT COALESCE(sector, 'Unknown') AS sector,
+                                             SUM(pnl) AS pnl
+                                      FROM w GROUP BY 1) s),
+                    'best', (SELECT row_to_json(b) FROM
+                             (SELECT ticker, pnl FROM w ORDER BY pnl DESC LIMIT 1) b),
+                    'worst', (SELECT row_to_json(b) FROM
+                              (SELECT ticker, pnl FROM w ORDER BY pnl ASC LIMIT 1) b)
+                ) AS review
             """, {'start': week_start})
-        except:
-            week_trades = []
-        
-        if not week_trades:
+            review = rows[0]['review']
+            if isinstance(review, str):
+                review = json.loads(review)
+        except Exception as e:
+            logger.error(f"Error aggregating weekly trades: {e}")
+            return
+
+        total = int(review['total'])
+        if not total:
             logger.info("No trades this week")
             return
-        
-        # Analyze results
-        total = len(week_trades)
-        winning = sum(1 for t in week_trades if float(t.get('pnl', 0) or 0) > 0)
-        losing = sum(1 for t in week_trades if float(t.get('pnl', 0) or 0) < 0)
-        total_pnl = sum(float(t.get('pnl', 0) or 0) for t in week_trades)
-        win_rate = (winning / total * 100) if total > 0 else 0
-        
-        # Sector breakdown
-        sector_pnl = {}
-        for t in week_trades:
-            ticker = t['ticker']
-            pnl = float(t.get('pnl', 0) or 0)
-            # Get sector from company cache
-            company = self.db.query(
-                "SELECT sector FROM companies WHERE ticker = :t",
-                {'t': ticker}
-            )
-            sector = company[0]['sector'] if company else 'Unknown'
-            sector_pnl[sector] = sector_pnl.get(sector, 0) + pnl
-        
-        # Best and worst
-        best = max(week_trades, key=lambda t: float(t.get('pnl', 0) or 0))
-        worst = min(week_trades, key=lambda t: float(t.get('pnl', 0) or 0))
+
+        winning = int(review['winning'])
+        losing = int(review['losing'])
+        total_pnl = float(review['total_pnl'])
+        win_rate = winning / total * 100
+
+        sector_pnl = {s['sector']: float(s['pnl']) for s in review['sectors']}
+        best = review['best']
+        worst = review['worst']
         
         # Generate reflection
         patterns = []
@@ -398,9 +513,7 @@ class PaperTrader:
             """, (
                 str(week_start), str(week_end), total, winning, losing,
                 total_pnl, win_rate,
-                '{' + ','.join(f'"{p}"' for p in patterns) + '}',
-                '{' + ','.join(f'"{a}"' for a in adjustments) + '}',
-                reflection
+                patterns, adjustments, reflection
             ))
         except Exception as e:
             logger.error(f"Error saving review: {e}")
@@ -433,109 +546,117 @@ class PaperTrader:
         """
         logger.info(f"🔍 Validating hypotheses (trades older than {days_to_check} days)...")
         
-        # Get trades that need validation
-        trades = self.db.get_trades(limit=50)
+        # Let the database return only the candidates: unvalidated and
+        # old enough for the hypothesis window to have played out
+        df = self.db.get_trades_needing_validation(days_to_check)
         validated = []
-        
-        if trades.empty:
+
+        if df.empty:
             return validated
-        
-        for _, trade in trades.iterrows():
-            # Skip if already validated
-            if trade.get('outcome_correct') is not None:
-                continue
-            
-            # Skip if too recent
-            trade_date = trade['executed_at']
-            if isinstance(trade_date, str):
-                trade_date = datetime.fromisoformat(trade_date.replace('Z', '+00:00'))
-            
-            days_since = (datetime.now() - trade_date.replace(tzinfo=None)).days
-            if days_since < days_to_check:
-                continue
-            
-            # Get price now vs entry
-            ticker = trade['ticker']
-            entry_price = float(trade['price'])
-            
-            prices = self.db.get_latest_prices([ticker])
-            if prices.empty:
-                continue
-            
-            current_price = float(prices.iloc[0]['close'])
-            pnl_pct = ((current_price / entry_price) - 1) * 100
-            
-            # Determine if hypothesis was correct
-            # For BUY: correct if price went up
-            action = trade['action']
-            if action == 'BUY':
-                correct = pnl_pct > 0
-            else:  # SELL
-                correct = pnl_pct < 0
-            
-            outcome = f"{'Korrekt' if correct else 'Fel'}. Pris: {entry_price:.2f} → {current_price:.2f} ({pnl_pct:+.1f}%)"
-            
-            # Update trade with outcome
+
+        # One price fetch for every eligible ticker; trades without a
+        # price row drop out of the merge (same as the old skip)
+        prices = self.db.get_latest_prices(df['ticker'].unique().tolist())
+        if prices.empty:
+            return validated
+
+        df = df.merge(prices[['ticker', 'close']], on='ticker')
+        if df.empty:
+            return validated
+
+        df['entry_price'] = df['price'].astype(float)
+        df['current_price'] = df['close'].astype(float)
+        df['pnl_pct'] = (df['current_price'] / df['entry_price'] - 1) * 100
+        # For BUY: correct if price went up; for SELL: if it went down
+        df['correct'] = np.where(df['action'] == 'BUY', df['pnl_pct'] > 0, df['pnl_pct'] < 0)
+
+        # Pull the columns out once as buffers; the loop below only does
+        # string formatting, no per-row casts or attribute dispatch
+        ids = df['id'].astype('int64').to_numpy().tolist()
+        tickers_col = df['ticker'].tolist()
+        entries = df['entry_price'].to_numpy().tolist()
+        currents = df['current_price'].to_numpy().tolist()
+        pnl_pcts = df['pnl_pct'].to_numpy().tolist()
+        corrects = df['correct'].to_numpy().tolist()
+        hypotheses = df['hypothesis'].fillna('').tolist() if 'hypothesis' in df else [''] * len(df)
+        reasonings = df['reasoning'].fillna('').tolist() if 'reasoning' in df else [''] * len(df)
+
+        outcomes = []
+        learnings = []
+        for trade_id, ticker, entry, current, pnl_pct, correct, hypothesis, reasoning in zip(
+                ids, tickers_col, entries, currents, pnl_pcts, corrects, hypotheses, reasonings):
+            outcome = (
+                f"{'Korrekt' if correct else 'Fel'}. Pris: {entry:.2f} → "
+                f"{current:.2f} ({pnl_pct:+.1f}%)"
+            )
+
+            outcomes.append(outcome)
+            validated.append({
+                'ticker': ticker,
+                'correct': correct,
+                'pnl_pct': pnl_pct,
+                'hypothesis': hypothesis,
+                'outcome': outcome,
+            })
+
+            # Extract learning; inserted in one batch below
+            learning = self._extract_learning_from_trade(trade_id, ticker, reasoning, correct, pnl_pct)
+            if learning:
+                learnings.append(learning)
+
+            logger.info("  %s %s: %s", '✅' if correct else '❌', ticker, outcome)
+
+        # One statement for all the outcome updates: the parallel arrays
+        # unnest into a value set joined against trades on id
+        try:
+            self.db.execute("""
+                UPDATE trades t SET
+                    outcome = v.outcome,
+                    outcome_correct = v.correct,
+                    pnl = (v.current_price - t.price) * t.shares
+                FROM (SELECT unnest(%s) AS id,
+                             unnest(%s) AS outcome,
+                             unnest(%s) AS correct,
+                             unnest(%s) AS current_price) v
+                WHERE t.id = v.id
+            """, (ids, outcomes, corrects, currents))
+        except Exception as e:
+            logger.error(f"Error saving trade validations: {e}")
+            return []
+
+        if learnings:
             try:
-                self.db.execute("""
-                    UPDATE trades SET 
-                        outcome = %s,
-                        outcome_correct = %s,
-                        pnl = %s
-                    WHERE id = %s
-                """, (outcome, correct, pnl_pct * float(trade['shares']) * entry_price / 100, int(trade['id'])))
-                
-                validated.append({
-                    'ticker': ticker,
-                    'correct': correct,
-                    'pnl_pct': pnl_pct,
-                    'hypothesis': trade.get('hypothesis', ''),
-                    'outcome': outcome,
-                })
-                
-                # Extract learning
-                self._extract_learning_from_trade(trade, correct, pnl_pct)
-                
-                logger.info(f"  {'✅' if correct else '❌'} {ticker}: {outcome}")
-                
+                self.db.add_learnings(learnings)
+                for learning in learnings:
+                    logger.info("📚 Learning added: %.60s...", learning['content'])
             except Exception as e:
-                logger.error(f"Error validating {ticker}: {e}")
-        
+                logger.error(f"Error adding learnings: {e}")
+
         if validated:
             logger.info(f"📊 Validated {len(validated)} trades: {sum(1 for v in validated if v['correct'])}/{len(validated)} correct")
-        
+
         return validated
     
-    def _extract_learning_from_trade(self, trade, correct: bool, pnl_pct: float):
-        """Extract a learning from a validated trade."""
-        ticker = trade['ticker']
-        reasoning = trade.get('reasoning', '')
-        hypothesis = trade.get('hypothesis', '')
-        
+    def _extract_learning_from_trade(self, trade_id: int, ticker: str, reasoning: str,
+                                     correct: bool, pnl_pct: float) -> Optional[Dict]:
+        """Extract a learning from a validated trade, or None if insignificant."""
         if correct and pnl_pct > 5:
             # Strong win - learn what worked
-            learning = {
+            return {
                 'category': 'pattern',
                 'content': f"[FUNKAR] {ticker}: {reasoning[:100]}. Resultat: {pnl_pct:+.1f}%",
-                'source_trade_ids': [int(trade['id'])],
+                'source_trade_ids': [trade_id],
                 'confidence': min(80, 50 + pnl_pct),
             }
         elif not correct and pnl_pct < -5:
             # Strong loss - learn what didn't work
-            learning = {
+            return {
                 'category': 'mistake',
                 'content': f"[UNDVIK] {ticker}: {reasoning[:100]}. Resultat: {pnl_pct:+.1f}%",
-                'source_trade_ids': [int(trade['id'])],
+                'source_trade_ids': [trade_id],
                 'confidence': min(80, 50 + abs(pnl_pct)),
             }
-        else:
-            return  # Not significant enough to learn from
-        
-        try:
-            self.db.add_learning(learning)
-            logger.info(f"📚 Learning added: {learning['content'][:60]}...")
-        except Exception as e:
-            logger.error(f"Error adding learning: {e}")
+        return None  # Not significant enough to learn from
     
     def generate_trade_report(self, trade_id: int) -> str:
         """
@@ -30,6 +30,12 @@ class ReportTracker:
     def __init__(self, db):
         self.db = db
         self._company_cache = {}
+        # Shared session so the börskollen + Avanza fetches reuse one
+        # TCP/TLS connection pool instead of a fresh handshake per call
+        self._http = requests.Session()
+        self._http.headers.update({
+            'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36'
+        })
         self._load_companies()
     
     def _load_companies(self):
@@ -47,10 +53,7 @@ class ReportTracker:
         
         try:
             url = "https://www.borskollen.se/rapportkalender"
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36'
-            }
-            resp = requests.get(url, headers=headers, timeout=15)
+            resp = self._http.get(url, timeout=15)
             resp.raise_for_status()
             
             soup = BeautifulSoup(resp.text, 'html.parser')
@@ -147,10 +150,7 @@ class ReportTracker:
         """Fallback: try Avanza's report calendar."""
         try:
             url = "https://www.avanza.se/placera/rapportkalender.html"
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36'
-            }
-            resp = requests.get(url, headers=headers, timeout=15)
+            resp = self._http.get(url, timeout=15)
             if resp.status_code == 200:
                 soup = BeautifulSoup(resp.text, 'html.parser')
                 rows = soup.select('tr')
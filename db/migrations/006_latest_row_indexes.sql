@@ -0,0 +1,3 @@
+-- Migration 006: Indexes for latest-row (DISTINCT ON) scans used by the brain context
+CREATE INDEX IF NOT EXISTS idx_prices_ticker_date ON prices(ticker, date DESC);
+CREATE INDEX IF NOT EXISTS idx_macro_symbol_date ON macro(symbol, date DESC);
@@ -0,0 +1,8 @@
+-- Migration 007: Store bulky ai_decisions payloads compressed
+-- market_data_json and raw_response become zlib-compressed BYTEA.
+-- Existing text rows are carried over as raw UTF-8 bytes; the reader in
+-- the agent falls back to plain decoding when zlib inflate fails.
+ALTER TABLE ai_decisions
+    ALTER COLUMN market_data_json TYPE BYTEA USING convert_to(market_data_json, 'UTF8');
+ALTER TABLE ai_decisions
+    ALTER COLUMN raw_response TYPE BYTEA USING convert_to(raw_response, 'UTF8');
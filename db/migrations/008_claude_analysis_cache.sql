@@ -0,0 +1,8 @@
+-- Migration 008: Cache for Claude trade analyses
+-- Keyed on a hash of the structured prompt inputs so re-reviewing a trade
+-- with the same context skips the API call.
+CREATE TABLE IF NOT EXISTS claude_analysis_cache (
+    prompt_hash CHAR(64) PRIMARY KEY,
+    response JSONB NOT NULL,
+    created_at TIMESTAMP DEFAULT NOW()
+);
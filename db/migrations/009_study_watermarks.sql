@@ -0,0 +1,8 @@
+-- Migration 009: High-watermark table for incremental study runs
+-- Lets run_report_study resume after the last processed report date
+-- instead of anti-joining report_reactions on every cycle.
+CREATE TABLE IF NOT EXISTS study_watermarks (
+    study_name VARCHAR(50) PRIMARY KEY,
+    last_processed TIMESTAMP NOT NULL,
+    updated_at TIMESTAMP DEFAULT NOW()
+);
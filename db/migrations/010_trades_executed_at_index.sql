@@ -0,0 +1,2 @@
+-- Migration 010: Composite index for the study modules' 6-month trade scans
+CREATE INDEX IF NOT EXISTS idx_trades_executed_at_ticker ON trades(executed_at, ticker);
@@ -0,0 +1,6 @@
+-- Migration 011: Tag catalyst-indicating research notes at insert time
+-- Replaces the per-ticker LOWER(content) LIKE scans in catalyst detection.
+ALTER TABLE research_notes ADD COLUMN IF NOT EXISTS has_catalyst BOOLEAN DEFAULT FALSE;
+UPDATE research_notes
+SET has_catalyst = TRUE
+WHERE content ~* '(rapport|lansering|contract|avtal)';
@@ -51,7 +51,7 @@ def main():
         # Test 3: Test trailing stop update (this tests the ORDER BY fix)
         logger.info("🧪 Testing trailing stop update...")
         # This will only work if we have positions, but should not crash on SQL syntax
-        trader._update_trailing_stop("TEST", 100.0, 6.0)
+        trader._update_trailing_stops_bulk([("TEST", 102.0)])
         logger.info(f"✅ Trailing stop update completed without SQL errors")
         
     except Exception as e: